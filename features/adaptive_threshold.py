@@ -0,0 +1,184 @@
+# File: features/adaptive_threshold.py
+# Deskripsi: Adaptive thresholding berbasis integral image (mean, Gaussian,
+#            Niblack, Sauvola) - statistik lokal block size terakhir di-cache
+#            sehingga sweep parameter C/k cukup satu perbandingan per pixel
+
+import cv2
+import numpy as np
+
+from features.binary_mask import PackedMask
+from features.image_cache import ImageCache
+
+
+class AdaptiveThresholder:
+    """
+    Adaptive threshold engine for one image
+
+    Local means and standard deviations come from a cached integral image
+    and integral of squares, so any block size costs O(1) per pixel. The
+    statistics of the last STATS_KEPT block sizes are cached too (each is
+    two float32 planes), so sweeping C or k only redoes the final
+    comparison while a block-size sweep does not pile up memory.
+
+    "mean" and "gaussian" round the local mean to uint8 and compare
+    gray - mean > -ceil(C) in integers, like cv2.adaptiveThreshold, so
+    interior pixels match OpenCV exactly. The integral windows are clamped
+    to the image, so "mean" border pixels (within block_size // 2 of an
+    edge) use the mean of the in-image part of their window instead of
+    OpenCV's replicated border.
+
+    Usage:
+        engine = AdaptiveThresholder(gray)
+        for k in (0.1, 0.2, 0.3):
+            binary = engine.apply("sauvola", block_size=31, k=k)
+    """
+
+    METHODS = ("mean", "gaussian", "niblack", "sauvola")
+
+    # Default k per method (Niblack uses a negative k for dark text)
+    DEFAULT_K = {"niblack": -0.2, "sauvola": 0.2}
+
+    # Dynamic range of the standard deviation for Sauvola (8-bit images)
+    SAUVOLA_R = 128.0
+
+    # Rows processed per band when reading window sums from the integrals
+    BAND_ROWS = 512
+
+    # Block sizes whose local statistics stay cached
+    STATS_KEPT = 2
+
+    def __init__(self, image):
+        self.cache = ImageCache.for_image(image)
+        self.gray = self.cache.gray
+
+    @staticmethod
+    def normalize_block_size(block_size):
+        """Odd block size of at least 3, as cv2.adaptiveThreshold requires"""
+        block_size = max(3, int(block_size))
+        return block_size if block_size % 2 == 1 else block_size + 1
+
+    def integrals(self):
+        """(sum, squared sum) integral images, float64 (h + 1, w + 1)"""
+        return self.cache.get(
+            "integral2",
+            lambda: cv2.integral2(self.gray, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F),
+        )
+
+    def _cached(self, key, factory):
+        """Cache per block size, keeping only the STATS_KEPT most recent sizes"""
+        recent = self.cache.get("adaptive_recent", list)
+        if key in recent:
+            recent.remove(key)
+        recent.append(key)
+        while len(recent) > self.STATS_KEPT:
+            self.cache.discard(recent.pop(0))
+        return self.cache.get(key, factory)
+
+    def local_stats(self, block_size):
+        """
+        Local mean and standard deviation over block_size x block_size windows
+
+        Returns:
+            (mean, std) float32 arrays, cached for recent block sizes
+        """
+        block_size = self.normalize_block_size(block_size)
+        return self._cached(("local_stats", block_size), lambda: self._compute_stats(block_size))
+
+    def _compute_stats(self, block_size):
+        total, squares = self.integrals()
+        h, w = self.gray.shape
+        r = block_size // 2
+
+        # Clamped window bounds in integral-image coordinates
+        y0 = np.clip(np.arange(h) - r, 0, h)
+        y1 = np.clip(np.arange(h) + r + 1, 0, h)
+        x0 = np.clip(np.arange(w) - r, 0, w)
+        x1 = np.clip(np.arange(w) + r + 1, 0, w)
+        col_width = (x1 - x0).astype(np.float64)
+
+        mean = np.empty((h, w), dtype=np.float32)
+        std = np.empty((h, w), dtype=np.float32)
+        for start in range(0, h, self.BAND_ROWS):
+            rows = slice(start, start + self.BAND_ROWS)
+            area = (y1[rows] - y0[rows]).astype(np.float64)[:, None] * col_width
+
+            # Row differences first, then column differences
+            strip = total[y1[rows]] - total[y0[rows]]
+            band_mean = (strip[:, x1] - strip[:, x0]) / area
+            strip = squares[y1[rows]] - squares[y0[rows]]
+            band_var = (strip[:, x1] - strip[:, x0]) / area - band_mean * band_mean
+
+            mean[rows] = band_mean
+            std[rows] = np.sqrt(np.maximum(band_var, 0.0))
+        return mean, std
+
+    def box_mean(self, block_size):
+        """Local box mean rounded to uint8, as ADAPTIVE_THRESH_MEAN_C uses it"""
+        mean, _ = self.local_stats(block_size)
+        return np.rint(mean).astype(np.uint8)
+
+    def gaussian_mean(self, block_size):
+        """
+        Gaussian-weighted local mean, cached for recent block sizes
+
+        Same kernel, border and rounding as cv2.adaptiveThreshold's
+        ADAPTIVE_THRESH_GAUSSIAN_C (float blur rounded to uint8), so results
+        match OpenCV exactly.
+        """
+        block_size = self.normalize_block_size(block_size)
+
+        def compute():
+            blurred = cv2.GaussianBlur(self.gray.astype(np.float32), (block_size, block_size), 0,
+                                       borderType=cv2.BORDER_REPLICATE | cv2.BORDER_ISOLATED)
+            return np.rint(blurred).astype(np.uint8)
+
+        return self._cached(("gaussian_mean", block_size), compute)
+
+    def threshold_map(self, method="gaussian", block_size=11, C=2, k=None):
+        """
+        Per-pixel threshold T; a pixel is foreground when gray > T
+
+        Args:
+            method: 'mean', 'gaussian', 'niblack' or 'sauvola'
+            block_size: Window size (made odd, at least 3)
+            C: Constant subtracted from T
+            k: Niblack/Sauvola weight of the local standard deviation
+
+        Returns:
+            Threshold map (float32)
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Method must be one of {', '.join(self.METHODS)}")
+        if k is None:
+            k = self.DEFAULT_K.get(method, 0.0)
+
+        if method == "gaussian":
+            threshold = self.gaussian_mean(block_size).astype(np.float32)
+        elif method == "mean":
+            threshold = self.box_mean(block_size).astype(np.float32)
+        else:
+            mean, std = self.local_stats(block_size)
+            if method == "niblack":
+                threshold = mean + np.float32(k) * std
+            else:
+                threshold = mean * (1.0 + np.float32(k) * (std / np.float32(self.SAUVOLA_R) - 1.0))
+        threshold -= np.float32(C)
+        return threshold
+
+    def apply(self, method="gaussian", block_size=11, C=2, k=None, packed=False):
+        """
+        Binarize the image
+
+        Returns:
+            uint8 0/255 image, or a PackedMask when packed=True
+        """
+        if method in ("mean", "gaussian"):
+            # Integer comparison like OpenCV: gray - mean > -ceil(C)
+            mean = self.box_mean(block_size) if method == "mean" else self.gaussian_mean(block_size)
+            foreground = cv2.subtract(self.gray, mean, dtype=cv2.CV_16S) > -int(np.ceil(C))
+        else:
+            foreground = self.gray > self.threshold_map(method, block_size, C, k)
+
+        if packed:
+            return PackedMask.from_uint8(foreground.view(np.uint8), 0)
+        return foreground.view(np.uint8) * np.uint8(255)
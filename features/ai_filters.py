@@ -2,10 +2,16 @@
 # Author: Min (Fixed & Optimized for GUI)
 # Deskripsi: AI-based filters untuk image enhancement
 
+from functools import lru_cache
+
 import cv2
 import numpy as np
 from PIL import Image
 
+from features.image_cache import ImageCache
+from features.image_statistics import ImageStatistics
+from features.white_balance import WhiteBalance
+
 # Optional imports - check availability at runtime
 try:
     from rembg import remove, new_session
@@ -32,6 +38,12 @@ except ImportError:
 class AIColorCorrection:
     """Class untuk AI-based color correction"""
     
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def get_clahe(clip_limit=3.0, tile_size=8):
+        """CLAHE object, dibuat sekali per kombinasi (clip_limit, tile_size)"""
+        return cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(tile_size, tile_size))
+    
     @staticmethod
     def apply_clahe(img, clip_limit=3.0, tile_size=8):
         """
@@ -46,13 +58,12 @@ class AIColorCorrection:
             Enhanced image
         """
         try:
-            # Convert BGR to LAB color space
-            lab = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
+            # Convert BGR to LAB color space (shared with other ops on this image)
+            lab = ImageCache.for_image(img).lab
             l, a, b = cv2.split(lab)
             
             # Apply CLAHE to L channel
-            clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(tile_size, tile_size))
-            cl = clahe.apply(l)
+            cl = AIColorCorrection.get_clahe(float(clip_limit), int(tile_size)).apply(l)
             
             # Merge channels back
             merged = cv2.merge((cl, a, b))
@@ -87,23 +98,39 @@ class AIColorCorrection:
             gamma > 1.0 = darker (e.g., 2.0 = much darker)
         """
         try:
-            invGamma = 1.0 / gamma
-            table = np.array([(i / 255.0) ** invGamma * 255 for i in np.arange(256)]).astype("uint8")
-            return cv2.LUT(img, table)
+            return cv2.LUT(img, AIColorCorrection.gamma_table(gamma))
         except Exception as e:
             print(f"❌ Gamma correction error: {e}")
             return img
 
     @staticmethod
-    def white_balance(img):
-        """Auto white balance untuk koreksi warna"""
+    def gamma_table(gamma=1.0):
+        """Lookup table (256 entri) untuk gamma correction"""
+        invGamma = 1.0 / gamma
+        return ((np.arange(256) / 255.0) ** invGamma * 255).astype("uint8")
+    
+    @staticmethod
+    def tone_table(brightness=0, contrast=0, gamma=1.0):
+        """
+        Brightness/contrast lalu gamma, digabung menjadi satu lookup table
+        (hasil sama dengan adjust_brightness_contrast_ai + gamma_correction)
+        """
+        alpha = 1 + contrast / 100
+        levels = np.abs(np.arange(256) * alpha + brightness)
+        scaled = np.clip(np.rint(levels), 0, 255).astype(np.uint8)
+        return AIColorCorrection.gamma_table(gamma)[scaled]
+    
+    @staticmethod
+    def white_balance(img, method="lab", **kwargs):
+        """
+        Auto white balance untuk koreksi warna
+        
+        Args:
+            method: 'lab' (default, gray-world di LAB), 'gray_world', atau 'white_patch'
+            kwargs: strength (lab) atau percentile (white_patch)
+        """
         try:
-            result = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
-            avg_a = np.average(result[:, :, 1])
-            avg_b = np.average(result[:, :, 2])
-            result[:, :, 1] = result[:, :, 1] - ((avg_a - 128) * (result[:, :, 0] / 255.0) * 1.1)
-            result[:, :, 2] = result[:, :, 2] - ((avg_b - 128) * (result[:, :, 0] / 255.0) * 1.1)
-            return cv2.cvtColor(result, cv2.COLOR_LAB2BGR)
+            return WhiteBalance.balance(img, method, **kwargs)
         except Exception as e:
             print(f"❌ White balance error: {e}")
             return img
@@ -125,11 +152,19 @@ class AIColorCorrection:
         
         try:
             print("🎨 Applying AI Color Correction...")
-            corrected = AIColorCorrection.apply_clahe(img, clip_limit, tile_size)
+            # Satu konversi ke LAB: CLAHE di L, white balance di a/b
+            cache = ImageCache.for_image(img)
+            l, a, b = cache.plane("lab", 0), cache.plane("lab", 1), cache.plane("lab", 2)
+            l = AIColorCorrection.get_clahe(float(clip_limit), int(tile_size)).apply(l)
             if wb_toggle:
-                corrected = AIColorCorrection.white_balance(corrected)
-            corrected = AIColorCorrection.adjust_brightness_contrast_ai(corrected, brightness, contrast)
-            corrected = AIColorCorrection.gamma_correction(corrected, gamma)
+                # Rata-rata a/b diestimasi dari subsample, bukan semua pixel
+                means = ImageStatistics.channel_means(cache.lab)[1:]
+                a, b = WhiteBalance.correct_lab_planes(l, a, b, means=means)
+            corrected = cv2.cvtColor(cv2.merge((l, a, b)), cv2.COLOR_LAB2BGR)
+            
+            # Brightness/contrast + gamma dalam satu pass LUT (in-place)
+            table = AIColorCorrection.tone_table(brightness, contrast, gamma)
+            cv2.LUT(corrected, table, dst=corrected)
             print("✅ Color correction complete!")
             return corrected
         except Exception as e:
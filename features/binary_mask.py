@@ -0,0 +1,276 @@
+# File: features/binary_mask.py
+# Deskripsi: Representasi mask biner bit-packed (8 pixel per byte) untuk
+#            thresholding dan morphology dengan memori 8x lebih kecil
+
+import cv2
+import numpy as np
+
+
+class PackedMask:
+    """
+    Binary image stored 8 pixels per byte
+
+    Rows are packed with np.packbits (first pixel in the most significant
+    bit). Padding bits at the end of each row are always kept at 0.
+    Morphology and logical operations work directly on the packed bytes,
+    so a 24 MP mask costs 3 MB instead of 24 MB.
+
+    Usage:
+        mask = PackedMask.from_uint8(binary)
+        cleaned = mask.opening((25, 25)).closing((9, 9))
+        result = cleaned.to_uint8()
+    """
+
+    # Bits set per byte value, for counting foreground pixels
+    POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    # Rows converted per chunk, bounds the unpacked temporary in from/to_uint8
+    CHUNK_ROWS = 1024
+
+    def __init__(self, bits, shape):
+        """
+        Args:
+            bits: Packed rows, uint8 array (height, ceil(width / 8))
+            shape: (height, width) in pixels
+        """
+        self.bits = bits
+        self.shape = (int(shape[0]), int(shape[1]))
+
+    # ---- Conversion ----
+
+    @staticmethod
+    def from_uint8(image, threshold=127):
+        """
+        Pack an 8-bit image; pixels > threshold become foreground
+
+        Works chunk by chunk, so the boolean temporary never covers the
+        whole image.
+        """
+        if len(image.shape) == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        h, w = image.shape
+        bits = np.empty((h, (w + 7) // 8), dtype=np.uint8)
+        for y in range(0, h, PackedMask.CHUNK_ROWS):
+            chunk = image[y:y + PackedMask.CHUNK_ROWS]
+            bits[y:y + PackedMask.CHUNK_ROWS] = np.packbits(chunk > threshold, axis=1)
+        return PackedMask(bits, (h, w))
+
+    @staticmethod
+    def zeros(shape):
+        """Empty mask of (height, width)"""
+        return PackedMask(np.zeros((shape[0], (shape[1] + 7) // 8), dtype=np.uint8), shape)
+
+    def to_uint8(self, foreground=255):
+        """Unpack to a 0 / foreground uint8 image"""
+        h, w = self.shape
+        result = np.empty((h, w), dtype=np.uint8)
+        for y in range(0, h, PackedMask.CHUNK_ROWS):
+            chunk = np.unpackbits(self.bits[y:y + PackedMask.CHUNK_ROWS], axis=1, count=w)
+            np.multiply(chunk, foreground, out=result[y:y + PackedMask.CHUNK_ROWS])
+        return result
+
+    def copy(self):
+        return PackedMask(self.bits.copy(), self.shape)
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    def count(self):
+        """Number of foreground pixels"""
+        return int(PackedMask.POPCOUNT[self.bits].sum(dtype=np.int64))
+
+    # ---- Logical operations ----
+
+    def _wrap(self, bits):
+        return PackedMask(bits, self.shape)
+
+    def _clear_padding(self, bits):
+        """Zero the unused bits at the end of every row (in place)"""
+        extra = bits.shape[1] * 8 - self.shape[1]
+        if extra:
+            bits[:, -1] &= np.uint8((0xFF << extra) & 0xFF)
+        return bits
+
+    def __and__(self, other):
+        return self._wrap(np.bitwise_and(self.bits, other.bits))
+
+    def __or__(self, other):
+        return self._wrap(np.bitwise_or(self.bits, other.bits))
+
+    def __xor__(self, other):
+        return self._wrap(np.bitwise_xor(self.bits, other.bits))
+
+    def __invert__(self):
+        return self._wrap(self._clear_padding(np.invert(self.bits)))
+
+    def difference(self, other):
+        """Pixels in self but not in other"""
+        return self._wrap(np.bitwise_and(self.bits, np.invert(other.bits)))
+
+    # ---- Shifts on packed rows ----
+
+    @staticmethod
+    def _shift_columns(bits, s):
+        """
+        Shift pixels horizontally: result pixel x = source pixel x + s
+
+        Out-of-range source pixels read as 0. Works on whole bytes plus a
+        bit carry between neighbouring bytes.
+        """
+        if s == 0:
+            return bits
+        n = bits.shape[1]
+        q, r = divmod(abs(s), 8)
+        result = np.zeros_like(bits)
+        if q >= n:
+            return result
+
+        if s > 0:
+            # Pixels move towards the row start (left)
+            src = bits[:, q:]
+            result[:, :n - q] = src << r if r else src
+            if r:
+                result[:, :n - q - 1] |= src[:, 1:] >> (8 - r)
+        else:
+            # Pixels move towards the row end (right)
+            src = bits[:, :n - q]
+            result[:, q:] = src >> r if r else src
+            if r:
+                result[:, q + 1:] |= src[:, :-1] << (8 - r)
+        return result
+
+    @staticmethod
+    def _shift_rows(bits, s):
+        """Shift rows: result row y = source row y + s (zero fill)"""
+        if s == 0:
+            return bits
+        h = bits.shape[0]
+        result = np.zeros_like(bits)
+        if abs(s) >= h:
+            return result
+        if s > 0:
+            result[:h - s] = bits[s:]
+        else:
+            result[-s:] = bits[:h + s]
+        return result
+
+    @staticmethod
+    def _run_or(bits, length, direction, shift):
+        """
+        OR of `length` consecutive pixels starting at x, going forward (+1) or back (-1)
+
+        Built by doubling (1, 2, 4, ... pixels), so a run of length L costs
+        about log2(L) shifted ORs.
+        """
+        window, width = bits, 1
+        while width * 2 <= length:
+            window = window | shift(window, direction * width)
+            width *= 2
+        if width < length:
+            # Two overlapping power-of-two runs cover the rest (OR is idempotent)
+            window = window | shift(window, direction * (length - width))
+        return window
+
+    @staticmethod
+    def _window_or(bits, lo, hi, shift):
+        """
+        OR over the window [x + lo, x + hi] along one axis
+
+        Windows containing x are split into a forward and a backward run, so
+        windows hanging over either image edge still see their in-image pixels.
+        """
+        if lo > 0:
+            return shift(PackedMask._run_or(bits, hi - lo + 1, 1, shift), lo)
+        if hi < 0:
+            return shift(PackedMask._run_or(bits, hi - lo + 1, -1, shift), hi)
+        forward = PackedMask._run_or(bits, hi + 1, 1, shift)
+        backward = PackedMask._run_or(bits, 1 - lo, -1, shift)
+        return forward | backward
+
+    # ---- Morphology ----
+
+    @staticmethod
+    def _kernel_runs(kernel_size, kernel_type):
+        """(dy, x_lo, x_hi) row runs of a structuring element, relative to its center"""
+        shapes = {"rect": cv2.MORPH_RECT, "ellipse": cv2.MORPH_ELLIPSE, "cross": cv2.MORPH_CROSS}
+        if kernel_type not in shapes:
+            raise ValueError("Kernel type must be 'rect', 'ellipse', or 'cross'")
+        kernel = cv2.getStructuringElement(shapes[kernel_type], tuple(kernel_size))
+        h, w = kernel.shape
+        runs = []
+        for row in range(h):
+            cols = np.flatnonzero(kernel[row])
+            if len(cols):
+                runs.append((row - h // 2, int(cols[0]) - w // 2, int(cols[-1]) - w // 2))
+        return runs
+
+    def _dilate_bits(self, bits, kernel_size, kernel_type):
+        """Packed dilation (same offsets and border as cv2.dilate)"""
+        w, h = kernel_size
+        if kernel_type == "rect":
+            # Separable: horizontal window, then vertical window
+            bits = PackedMask._window_or(bits, -(w // 2), w - 1 - w // 2,
+                                         PackedMask._shift_columns)
+            bits = PackedMask._window_or(bits, -(h // 2), h - 1 - h // 2,
+                                         PackedMask._shift_rows)
+            return self._clear_padding(bits)
+
+        # Other shapes: OR of each row run, shifted to its row offset
+        horizontal = {}
+        result = np.zeros_like(bits)
+        for dy, x_lo, x_hi in PackedMask._kernel_runs(kernel_size, kernel_type):
+            if (x_lo, x_hi) not in horizontal:
+                horizontal[(x_lo, x_hi)] = PackedMask._window_or(
+                    bits, x_lo, x_hi, PackedMask._shift_columns)
+            result |= PackedMask._shift_rows(horizontal[(x_lo, x_hi)], dy)
+        return self._clear_padding(result)
+
+    def dilate(self, kernel_size=(3, 3), kernel_type="rect", iterations=1):
+        """Dilation on packed bits, matches cv2.dilate on the unpacked mask"""
+        bits = self.bits
+        for _ in range(iterations):
+            bits = self._dilate_bits(bits, kernel_size, kernel_type)
+        return self._wrap(bits)
+
+    def erode(self, kernel_size=(3, 3), kernel_type="rect", iterations=1):
+        """
+        Erosion on packed bits, matches cv2.erode on the unpacked mask
+
+        Computed as NOT dilate(NOT mask); pixels outside the image count as
+        foreground, like OpenCV's default erosion border.
+        """
+        return ~((~self).dilate(kernel_size, kernel_type, iterations))
+
+    def opening(self, kernel_size=(3, 3), kernel_type="rect"):
+        """Erosion followed by dilation (removes small specks)"""
+        return self.erode(kernel_size, kernel_type).dilate(kernel_size, kernel_type)
+
+    def closing(self, kernel_size=(3, 3), kernel_type="rect"):
+        """Dilation followed by erosion (fills small holes)"""
+        return self.dilate(kernel_size, kernel_type).erode(kernel_size, kernel_type)
+
+    def gradient(self, kernel_size=(3, 3), kernel_type="rect"):
+        """Dilation minus erosion (object outlines)"""
+        return self.dilate(kernel_size, kernel_type).difference(self.erode(kernel_size, kernel_type))
+
+    # ---- Connected components ----
+
+    def connected_components(self, connectivity=8):
+        """
+        Label connected foreground regions
+
+        OpenCV's labeling needs an 8-bit input, so the mask is unpacked for
+        the call; the int32 label image dominates memory either way.
+
+        Returns:
+            (num_labels, labels, stats, centroids) as cv2.connectedComponentsWithStats
+        """
+        return cv2.connectedComponentsWithStats(self.to_uint8(1), connectivity=connectivity)
+
+    def remove_small_components(self, min_area, connectivity=8):
+        """Drop foreground regions smaller than min_area pixels"""
+        _, labels, stats, _ = self.connected_components(connectivity)
+        keep = stats[:, cv2.CC_STAT_AREA] >= min_area
+        keep[0] = False  # background
+        return PackedMask.from_uint8(keep[labels].view(np.uint8), 0)
@@ -5,6 +5,15 @@
 import cv2
 import numpy as np
 
+from features.adaptive_threshold import AdaptiveThresholder
+from features.binary_mask import PackedMask
+from features.denoise import Denoiser
+from features.hue_saturation import HueSaturation
+from features.image_cache import ImageCache
+from features.image_statistics import ImageStatistics
+from features.operations import OperationRegistry
+from features.tone_curves import ToneCurves
+
 # --- 1. Fungsi Penyesuaian Warna Dasar ---
 
 def adjust_brightness_contrast(image, brightness=0, contrast=0):
@@ -21,37 +30,69 @@ def adjust_brightness_contrast(image, brightness=0, contrast=0):
 def adjust_saturation_hue(image, saturation=0, hue=0):
     """
     Mengatur saturasi dan hue dari sebuah gambar.
-    Ini memerlukan konversi ke color space HSV (Hue, Saturation, Value)
-    """
-    hsv_image = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-    h, s, v = cv2.split(hsv_image)
-    
-    # Menambahkan nilai saturasi dan memastikan tidak keluar dari rentang 0-255
-    s = cv2.add(s, saturation)
-    s[s > 255] = 255
-    s[s < 0] = 0
-    s = s.astype(np.uint8)
-
-    # Menambahkan nilai hue dan memastikan tidak keluar dari rentang 0-179 (range hue di OpenCV)
-    h = cv2.add(h, hue)
-    h[h > 179] = 179
-    h[h < 0] = 0
-    h = h.astype(np.uint8)
-
-    final_hsv = cv2.merge((h, s, v))
-    new_image = cv2.cvtColor(final_hsv, cv2.COLOR_HSV2BGR)
-    return new_image
+    - saturation: -255 hingga 255, ditambahkan lalu dijenuhkan ke 0-255
+    - hue: -179 hingga 179 (satuan hue OpenCV), diputar dengan wraparound
+      modulo 180 sehingga warna tidak menumpuk di ujung rentang
+    Satu konversi HSV dan satu pass cv2.LUT (lihat HueSaturation).
+    """
+    return HueSaturation.adjust(image, hue=hue, saturation=saturation)
 
 
 # --- 2. Fungsi Peningkatan Kontras Lanjutan ---
 
-def apply_histogram_equalization(image):
+def equalization_lut(hist):
+    """
+    Membuat lookup table histogram equalization dari histogram 256 bin
+    (rumus yang sama dengan cv2.equalizeHist).
+    """
+    hist = np.asarray(hist, dtype=np.float64).ravel()
+    first = int(np.flatnonzero(hist)[0])
+    remaining = hist.sum() - hist[first]
+    if remaining <= 0:
+        # Gambar satu warna: semua pixel ke nilai itu
+        return np.full(256, first, dtype=np.uint8)
+    cdf = np.cumsum(hist) - hist[first]
+    lut = np.clip(np.rint(cdf * (255.0 / remaining)), 0, 255)
+    lut[:first] = 0
+    return lut.astype(np.uint8)
+
+def apply_histogram_equalization(image, mode="gray", space="ycrcb", accuracy="balanced"):
     """
     Menerapkan histogram equalization untuk meningkatkan kontras gambar secara otomatis.
+    - mode: 'gray' (hasil grayscale 3 channel, perilaku lama),
+            'luminance' (hanya kanal kecerahan, warna dipertahankan),
+            'per_channel' (setiap kanal BGR di-equalize sendiri)
+    - space: ruang warna untuk mode luminance, 'ycrcb' (Y) atau 'lab' (L)
+    - accuracy: akurasi estimasi histogram ('fast', 'balanced', 'exact', atau jumlah sampel)
+    Catatan: default-nya kini 'balanced' - histogram diestimasi dari subsample,
+    sehingga untuk gambar di atas ~262k pixel hasilnya bisa berbeda sedikit
+    dari cv2.equalizeHist. Pakai accuracy="exact" untuk hasil identik.
     """
-    gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    equalized_gray = cv2.equalizeHist(gray_image)
-    return cv2.cvtColor(equalized_gray, cv2.COLOR_GRAY2BGR)
+    if mode not in ("gray", "luminance", "per_channel"):
+        raise ValueError("Mode must be 'gray', 'luminance', or 'per_channel'")
+    cache = ImageCache.for_image(image)
+    if mode == "gray" or len(cache.image.shape) == 2:
+        gray_image = cache.gray
+        # Histogram diestimasi dari subsample; resolusi penuh hanya untuk LUT
+        hist = ImageStatistics.histogram(gray_image, accuracy=accuracy)
+        equalized_gray = cv2.LUT(gray_image, equalization_lut(hist))
+        return cv2.cvtColor(equalized_gray, cv2.COLOR_GRAY2BGR)
+
+    if mode == "per_channel":
+        # Satu tabel (256, 1, 3) -> semua kanal dalam satu pass cv2.LUT
+        tables = [equalization_lut(ImageStatistics.histogram(image, channel, accuracy))
+                  for channel in range(3)]
+        return cv2.LUT(image, np.stack(tables, axis=1).reshape(256, 1, 3))
+
+    if space not in ("ycrcb", "lab"):
+        raise ValueError("Space must be 'ycrcb' or 'lab'")
+    converted = getattr(cache, space)
+    luminance = cache.plane(space, 0)
+    hist = ImageStatistics.histogram(converted, 0, accuracy)
+    equalized = cv2.merge((cv2.LUT(luminance, equalization_lut(hist)),
+                           cache.plane(space, 1), cache.plane(space, 2)))
+    back = cv2.COLOR_YCrCb2BGR if space == "ycrcb" else cv2.COLOR_LAB2BGR
+    return cv2.cvtColor(equalized, back)
 
 def adjust_gamma(image, gamma=1.0):
     """
@@ -64,34 +105,72 @@ def adjust_gamma(image, gamma=1.0):
     return cv2.LUT(image, table)
 
 
+def apply_levels(image, black=0, white=255, midtones=1.0):
+    """
+    Mengatur levels: black point, white point, dan gamma midtone.
+    - midtones: > 1 mencerahkan midtone, < 1 menggelapkan
+    """
+    return ToneCurves.apply(image, ToneCurves.levels_lut(black, white, midtones))
+
+def apply_curves(image, master=None, blue=None, green=None, red=None):
+    """
+    Menerapkan kurva tone (spline monoton) dengan titik kontrol (input, output) 0-255.
+    Semua kurva dikompilasi menjadi satu LUT per kanal dan diterapkan dalam satu pass.
+    """
+    channels = None if blue is None and green is None and red is None else (blue, green, red)
+    return ToneCurves.apply(image, ToneCurves.compile(channels, master))
+
+def apply_auto_levels(image, low=0.5, high=99.5, per_channel=False):
+    """
+    Auto-levels: persentil low/high dijadikan titik hitam/putih.
+    - per_channel: True untuk meregangkan setiap kanal (sekaligus menghapus color cast)
+    """
+    return ToneCurves.auto_levels(image, low, high, per_channel)
+
+
 # --- 3. Fungsi Thresholding (VERSI SUDAH DIPERBAIKI) ---
 
-def apply_global_threshold(image, threshold_value=127):
+def apply_global_threshold(image, threshold_value=127, packed=False):
     """
     Menerapkan thresholding global, mengubah gambar menjadi hitam putih.
     Fungsi ini sekarang mengembalikan gambar grayscale (1 channel).
+    - packed: True untuk mengembalikan PackedMask (8 pixel per byte)
     """
-    gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    gray_image = ImageCache.for_image(image).gray
+    if packed:
+        # Langsung di-pack tanpa membuat gambar hasil threshold ukuran penuh
+        return PackedMask.from_uint8(gray_image, threshold_value)
     _, thresholded_image = cv2.threshold(gray_image, threshold_value, 255, cv2.THRESH_BINARY)
     return thresholded_image # Langsung kembalikan hasil grayscale
 
-def apply_adaptive_threshold(image):
+def apply_adaptive_threshold(image, block_size=11, C=2, method="gaussian", k=None, packed=False):
     """
     Menerapkan adaptive thresholding, lebih baik untuk kondisi pencahayaan yang tidak merata.
     Fungsi ini sekarang mengembalikan gambar grayscale (1 channel).
+    - block_size: ukuran jendela lokal (dibuat ganjil, minimal 3)
+    - C: konstanta yang dikurangkan dari threshold lokal
+    - method: 'gaussian', 'mean', 'niblack', atau 'sauvola'
+    - k: bobot standar deviasi lokal untuk Niblack/Sauvola
+    - packed: True untuk mengembalikan PackedMask (8 pixel per byte)
     """
-    gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    thresholded_image = cv2.adaptiveThreshold(gray_image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
-    return thresholded_image # Langsung kembalikan hasil grayscale
+    # Statistik lokal di-cache per gambar, jadi mencoba beberapa nilai C/k murah
+    return AdaptiveThresholder(image).apply(method, block_size, C, k, packed)
+
+# Blur lewat OperationRegistry; ukuran kernel genap dinaikkan ke ganjil berikutnya
 
 def apply_average_blur(image, kernel_size=5):
-    if kernel_size % 2 == 0: kernel_size += 1
-    return cv2.blur(image, (kernel_size, kernel_size))
+    return OperationRegistry.apply("average_blur", image, kernel_size=kernel_size)
 
 def apply_gaussian_blur(image, kernel_size=5):
-    if kernel_size % 2 == 0: kernel_size += 1
-    return cv2.GaussianBlur(image, (kernel_size, kernel_size), 0)
+    return OperationRegistry.apply("gaussian_blur", image, kernel_size=kernel_size)
 
 def apply_median_blur(image, kernel_size=5):
-    if kernel_size % 2 == 0: kernel_size += 1
-    return cv2.medianBlur(image, kernel_size)
\ No newline at end of file
+    return OperationRegistry.apply("median_blur", image, kernel_size=kernel_size)
+
+def apply_denoise(image, method="guided", preset="balanced", workers=1, **params):
+    """
+    Denoise edge-preserving: 'guided', 'bilateral' atau 'nlmeans'
+    dengan preset 'fast' / 'balanced' / 'quality' (lihat Denoiser).
+    workers > 1 memproses gambar per band secara paralel.
+    """
+    return Denoiser.denoise(image, method, preset, workers, **params)
@@ -0,0 +1,210 @@
+# File: features/color_lut.py
+# Deskripsi: Engine 3D LUT (.cube) - load/save, aplikasi vektorisasi NumPy
+#            dengan interpolasi tetrahedral/trilinear per chunk, dan "bake"
+#            rangkaian penyesuaian warna menjadi satu 3D LUT
+
+import numpy as np
+
+from features.color_enhancement import adjust_brightness_contrast, adjust_gamma, adjust_saturation_hue
+from features.white_balance import WhiteBalance
+
+
+class ColorLUT3D:
+    """
+    3D color lookup table
+
+    The lattice is stored as table[b, g, r] -> (B, G, R) float32 in 0-1, so
+    it indexes OpenCV's BGR pixels directly. .cube files (Adobe/Resolve
+    format, red varying fastest) are converted on load and save.
+
+    Usage:
+        lut = ColorLUT3D.load("film.cube")
+        graded = lut.apply(image)                      # tetrahedral
+        baked = ColorLUT3D.bake(lambda img: my_chain(img), size=33)
+    """
+
+    METHODS = ("tetrahedral", "trilinear")
+
+    # Pixels interpolated per chunk (bounds the float32 temporaries)
+    CHUNK_PIXELS = 1 << 18
+
+    def __init__(self, table, domain_min=(0.0, 0.0, 0.0), domain_max=(1.0, 1.0, 1.0), title=None):
+        """
+        Args:
+            table: (N, N, N, 3) array indexed [b, g, r] holding (B, G, R) outputs
+            domain_min, domain_max: Input domain as (R, G, B), like in .cube files
+            title: Optional title
+        """
+        table = np.asarray(table, dtype=np.float32)
+        if table.ndim != 4 or table.shape[3] != 3 or len(set(table.shape[:3])) != 1:
+            raise ValueError("3D LUT table must have shape (N, N, N, 3)")
+        self.table = table
+        self.size = table.shape[0]
+        self.domain_min = np.asarray(domain_min, dtype=np.float32)
+        self.domain_max = np.asarray(domain_max, dtype=np.float32)
+        self.title = title
+
+    # ---- Construction ----
+
+    @staticmethod
+    def identity(size=33):
+        """LUT that leaves colors unchanged"""
+        axis = np.linspace(0.0, 1.0, size, dtype=np.float32)
+        b, g, r = np.meshgrid(axis, axis, axis, indexing="ij")
+        return ColorLUT3D(np.stack((b, g, r), axis=-1))
+
+    @staticmethod
+    def load(path):
+        """Read a .cube file (3D LUTs only)"""
+        size, title = None, None
+        domain_min, domain_max = (0.0, 0.0, 0.0), (1.0, 1.0, 1.0)
+        values = []
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                keyword = line.split()[0].upper()
+                if keyword == "TITLE":
+                    title = line[5:].strip().strip('"')
+                elif keyword == "LUT_3D_SIZE":
+                    size = int(line.split()[1])
+                elif keyword == "LUT_1D_SIZE":
+                    raise ValueError("1D .cube LUTs are not supported")
+                elif keyword == "DOMAIN_MIN":
+                    domain_min = tuple(float(v) for v in line.split()[1:4])
+                elif keyword == "DOMAIN_MAX":
+                    domain_max = tuple(float(v) for v in line.split()[1:4])
+                elif keyword[0].isdigit() or keyword[0] in "-+.":
+                    values.append(line.split()[:3])
+
+        if size is None:
+            raise ValueError("Missing LUT_3D_SIZE in .cube file")
+        data = np.asarray(values, dtype=np.float32)
+        if data.shape != (size ** 3, 3):
+            raise ValueError(f"Expected {size ** 3} LUT entries, found {len(data)}")
+
+        # Red varies fastest -> reshape gives [b, g, r]; store outputs as BGR
+        table = data.reshape(size, size, size, 3)[..., ::-1]
+        return ColorLUT3D(np.ascontiguousarray(table), domain_min, domain_max, title)
+
+    def save(self, path, title=None):
+        """Write the LUT as a .cube file"""
+        title = title or self.title
+        rgb = self.table[..., ::-1].reshape(-1, 3)
+        with open(path, "w") as f:
+            if title:
+                f.write(f'TITLE "{title}"\n')
+            f.write(f"LUT_3D_SIZE {self.size}\n")
+            f.write("DOMAIN_MIN {:.6f} {:.6f} {:.6f}\n".format(*self.domain_min))
+            f.write("DOMAIN_MAX {:.6f} {:.6f} {:.6f}\n".format(*self.domain_max))
+            np.savetxt(f, rgb, fmt="%.6f")
+
+    @staticmethod
+    def bake(adjust, size=33):
+        """
+        Capture a color adjustment chain as a 3D LUT
+
+        The identity lattice is rendered as a small uint8 BGR image, passed
+        through adjust, and read back. Only per-pixel color operations can be
+        baked: image-dependent steps (white balance, auto levels) must have
+        their parameters measured on the real image first, e.g. by baking
+        lambda img: WhiteBalance.apply_gains(img, gains).
+
+        Args:
+            adjust: Callable taking and returning a BGR uint8 image
+            size: Lattice size per axis (17-65)
+        """
+        lattice = np.rint(ColorLUT3D.identity(size).table * 255.0).astype(np.uint8)
+        adjusted = adjust(lattice.reshape(size * size, size, 3))
+        table = np.asarray(adjusted, dtype=np.float32).reshape(size, size, size, 3) / 255.0
+        return ColorLUT3D(table)
+
+    @staticmethod
+    def from_adjustments(brightness=0, contrast=0, saturation=0, hue=0, gamma=1.0,
+                         white_balance_gains=None, size=33):
+        """
+        Bake the standard adjustment chain into a 3D LUT
+
+        Order: white balance gains, brightness/contrast, saturation/hue, gamma.
+        """
+        def chain(image):
+            if white_balance_gains is not None:
+                image = WhiteBalance.apply_gains(image, white_balance_gains)
+            if brightness or contrast:
+                image = adjust_brightness_contrast(image, brightness, contrast)
+            if saturation or hue:
+                image = adjust_saturation_hue(image, saturation, hue)
+            if gamma != 1.0:
+                image = adjust_gamma(image, gamma)
+            return image
+        return ColorLUT3D.bake(chain, size)
+
+    # ---- Application ----
+
+    def _lattice_coordinates(self, pixels):
+        """uint8 BGR pixels (n, 3) -> float lattice coordinates in [0, N - 1]"""
+        scale = np.float32((self.size - 1) / 255.0)
+        coords = pixels.astype(np.float32) * scale
+        low, high = self.domain_min[::-1], self.domain_max[::-1]
+        if np.any(low != 0.0) or np.any(high != 1.0):
+            coords = (coords / np.float32(self.size - 1) - low) / (high - low) * np.float32(self.size - 1)
+        return np.clip(coords, 0.0, self.size - 1)
+
+    def _interpolate(self, pixels, method):
+        """Interpolate a chunk of (n, 3) BGR pixels, returns (n, 3) float32 in 0-1"""
+        n = self.size
+        flat = self.table.reshape(-1, 3)
+        strides = np.array([n * n, n, 1])
+
+        coords = self._lattice_coordinates(pixels)
+        base = np.minimum(coords.astype(np.int32), n - 2)
+        frac = coords - base
+        index = base @ strides
+
+        if method == "trilinear":
+            result = np.zeros((len(pixels), 3), dtype=np.float32)
+            for corner in range(8):
+                bits = np.array([(corner >> 2) & 1, (corner >> 1) & 1, corner & 1])
+                weight = np.prod(np.where(bits, frac, 1.0 - frac), axis=1)
+                result += weight[:, None] * flat[index + int(bits @ strides)]
+            return result
+
+        # Tetrahedral: walk from the low corner to the high corner along the
+        # axes in order of decreasing fraction
+        order = np.argsort(-frac, axis=1)
+        f = np.take_along_axis(frac, order, axis=1)
+        step = strides[order]
+        second = index + step[:, 0]
+        third = second + step[:, 1]
+        result = (1.0 - f[:, 0])[:, None] * flat[index]
+        result += (f[:, 0] - f[:, 1])[:, None] * flat[second]
+        result += (f[:, 1] - f[:, 2])[:, None] * flat[third]
+        result += f[:, 2][:, None] * flat[index + strides.sum()]
+        return result
+
+    def apply(self, image, method="tetrahedral"):
+        """
+        Apply the LUT to a BGR uint8 image
+
+        Args:
+            image: BGR uint8 image
+            method: 'tetrahedral' (default, matches most grading tools) or 'trilinear'
+
+        Returns:
+            New BGR uint8 image
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Method must be one of {', '.join(self.METHODS)}")
+        pixels = image.reshape(-1, 3)
+        output = np.empty_like(pixels)
+        for start in range(0, len(pixels), self.CHUNK_PIXELS):
+            chunk = pixels[start:start + self.CHUNK_PIXELS]
+            values = self._interpolate(chunk, method)
+            output[start:start + self.CHUNK_PIXELS] = np.clip(np.rint(values * 255.0), 0, 255)
+        return output.reshape(image.shape)
+
+
+def apply_cube_lut(img, path, method="tetrahedral"):
+    """Shortcut: load a .cube file and apply it"""
+    return ColorLUT3D.load(path).apply(img, method)
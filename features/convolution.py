@@ -0,0 +1,230 @@
+# File: features/convolution.py
+# Deskripsi: Dispatcher konvolusi - memilih spatial, separable, atau FFT
+#            berdasarkan ukuran kernel dan ukuran gambar
+
+import time
+
+import cv2
+import numpy as np
+
+
+class ConvolutionDispatcher:
+    """Pick the cheapest convolution strategy for a kernel / image pair"""
+
+    # Defaults measured with calibrate() on a 1024x1024 image; rerun on new hardware
+    # Kernel radius (pixels) up to which a full 2D spatial kernel is used
+    SPATIAL_MAX_RADIUS = 30
+    # Kernel radius up to which a separable kernel stays spatial (row + column pass)
+    SEPARABLE_MAX_RADIUS = 100
+    # Below this many pixels the FFT setup cost never pays off
+    FFT_MIN_PIXELS = 256 * 256
+
+    @staticmethod
+    def is_separable(kernel, tol=1e-6):
+        """
+        Check whether a 2D kernel is rank-1 (separable)
+
+        Args:
+            kernel: 2D kernel
+            tol: Relative tolerance for the second singular value
+
+        Returns:
+            (separable, column_kernel, row_kernel)
+        """
+        kernel = np.asarray(kernel, dtype=np.float64)
+        if kernel.ndim != 2:
+            return False, None, None
+
+        u, s, vt = np.linalg.svd(kernel)
+        if s[0] == 0 or (len(s) > 1 and s[1] > tol * s[0]):
+            return False, None, None
+
+        scale = np.sqrt(s[0])
+        column = (u[:, 0] * scale).astype(np.float32)
+        row = (vt[0, :] * scale).astype(np.float32)
+        return True, column, row
+
+    @staticmethod
+    def choose_method(image_shape, kernel_shape, separable=False):
+        """
+        Decide which convolution path to use
+
+        Args:
+            image_shape: Image shape (height, width[, channels])
+            kernel_shape: Kernel shape (height, width)
+            separable: Whether the kernel is rank-1
+
+        Returns:
+            "spatial", "separable" or "fft"
+        """
+        h, w = image_shape[:2]
+        radius = max(kernel_shape[0], kernel_shape[1]) // 2
+
+        if separable:
+            if radius <= ConvolutionDispatcher.SEPARABLE_MAX_RADIUS or \
+                    h * w < ConvolutionDispatcher.FFT_MIN_PIXELS:
+                return "separable"
+            return "fft"
+
+        if radius <= ConvolutionDispatcher.SPATIAL_MAX_RADIUS or \
+                h * w < ConvolutionDispatcher.FFT_MIN_PIXELS:
+            return "spatial"
+        return "fft"
+
+    @staticmethod
+    def fft_convolve(image, kernel):
+        """
+        Correlate image with kernel in the frequency domain
+
+        Matches cv2.filter2D semantics (correlation, anchor at the kernel
+        center, BORDER_REFLECT_101) so results are interchangeable.
+
+        Args:
+            image: Input image (grayscale or multi-channel)
+            kernel: 2D kernel
+
+        Returns:
+            Filtered image with the same dtype as the input
+        """
+        kernel = np.asarray(kernel, dtype=np.float32)
+        kh, kw = kernel.shape
+        h, w = image.shape[:2]
+
+        # Pad like OpenCV so border pixels behave the same as the spatial path
+        top, left = kh // 2, kw // 2
+        padded = cv2.copyMakeBorder(image, top, kh - 1 - top, left, kw - 1 - left,
+                                    cv2.BORDER_REFLECT_101)
+        padded = padded.astype(np.float32)
+
+        # Circular convolution of size >= padded size leaves the valid region intact
+        fh = cv2.getOptimalDFTSize(padded.shape[0])
+        fw = cv2.getOptimalDFTSize(padded.shape[1])
+
+        # Spectrum multiplication convolves; flip the kernel to get filter2D's correlation
+        flipped = kernel[::-1, ::-1]
+        kernel_fft = np.fft.rfft2(flipped, s=(fh, fw))
+        if padded.ndim == 3:
+            kernel_fft = kernel_fft[:, :, None]
+
+        image_fft = np.fft.rfft2(padded, s=(fh, fw), axes=(0, 1))
+        result = np.fft.irfft2(image_fft * kernel_fft, s=(fh, fw), axes=(0, 1))
+        result = result[kh - 1:kh - 1 + h, kw - 1:kw - 1 + w]
+
+        return ConvolutionDispatcher._to_dtype(result, image.dtype)
+
+    @staticmethod
+    def convolve(image, kernel, method="auto"):
+        """
+        Convolve image with kernel using the cheapest available path
+        (cv2.filter2D semantics)
+
+        Args:
+            image: Input image
+            kernel: 2D kernel
+            method: "auto", "spatial", "separable" or "fft"
+
+        Returns:
+            Filtered image (same dtype as input)
+        """
+        kernel = np.asarray(kernel, dtype=np.float32)
+        separable, column, row = ConvolutionDispatcher.is_separable(kernel)
+
+        if method == "auto":
+            method = ConvolutionDispatcher.choose_method(image.shape, kernel.shape, separable)
+        elif method == "separable" and not separable:
+            raise ValueError("Kernel is not separable")
+
+        if method == "separable":
+            return cv2.sepFilter2D(image, -1, row, column)
+        if method == "spatial":
+            return cv2.filter2D(image, -1, kernel)
+        if method == "fft":
+            return ConvolutionDispatcher.fft_convolve(image, kernel)
+        raise ValueError("Method must be 'auto', 'spatial', 'separable', or 'fft'")
+
+    @staticmethod
+    def gaussian_blur(image, kernel_size=3, sigma=1.0):
+        """
+        Gaussian blur routed through the dispatcher
+
+        Small and medium kernels use cv2.GaussianBlur (already separable);
+        very large kernels on big images switch to FFT.
+        """
+        method = ConvolutionDispatcher.choose_method(
+            image.shape, (kernel_size, kernel_size), separable=True
+        )
+        if method != "fft":
+            return cv2.GaussianBlur(image, (kernel_size, kernel_size), sigmaX=sigma, sigmaY=sigma)
+
+        g = cv2.getGaussianKernel(kernel_size, sigma, cv2.CV_32F)
+        return ConvolutionDispatcher.fft_convolve(image, g @ g.T)
+
+    @staticmethod
+    def _to_dtype(result, dtype):
+        """Round and saturate a float result back to the input dtype"""
+        if np.issubdtype(dtype, np.integer):
+            info = np.iinfo(dtype)
+            return np.clip(np.rint(result), info.min, info.max).astype(dtype)
+        return result.astype(dtype)
+
+    @staticmethod
+    def calibrate(image_size=(1024, 1024), radii=(3, 5, 7, 11, 15, 21, 31, 45, 61, 81, 101),
+                  repeats=3, update=True):
+        """
+        Micro-benchmark spatial, separable and FFT convolution to find crossovers
+
+        Args:
+            image_size: (height, width) of the synthetic benchmark image
+            radii: Kernel radii to time
+            repeats: Timing repetitions (best-of)
+            update: If True, store the measured crossovers on the class
+
+        Returns:
+            Dict {radius: {"spatial": s, "separable": s, "fft": s}}
+        """
+        rng = np.random.default_rng(0)
+        image = rng.integers(0, 256, size=image_size, dtype=np.uint8)
+
+        def best_time(func):
+            best = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                func()
+                best = min(best, time.perf_counter() - start)
+            return best
+
+        timings = {}
+        for radius in radii:
+            size = 2 * radius + 1
+            g = cv2.getGaussianKernel(size, -1, cv2.CV_32F)
+            kernel = g @ g.T
+            timings[radius] = {
+                "spatial": best_time(lambda: cv2.filter2D(image, -1, kernel)),
+                "separable": best_time(lambda: cv2.sepFilter2D(image, -1, g, g)),
+                "fft": best_time(lambda: ConvolutionDispatcher.fft_convolve(image, kernel)),
+            }
+
+        def crossover(method):
+            # Largest radius before FFT starts winning
+            for radius in sorted(radii):
+                if timings[radius]["fft"] < timings[radius][method]:
+                    return radius - 1
+            return max(radii)
+
+        if update:
+            ConvolutionDispatcher.SPATIAL_MAX_RADIUS = crossover("spatial")
+            ConvolutionDispatcher.SEPARABLE_MAX_RADIUS = crossover("separable")
+
+        return timings
+
+
+# ====== BENCHMARK ======
+if __name__ == "__main__":
+    print("\n⏱️ Convolution crossover benchmark (1024x1024, uint8)")
+    results = ConvolutionDispatcher.calibrate()
+    print(f"   {'radius':>6} {'spatial':>10} {'separable':>10} {'fft':>10}")
+    for r, t in results.items():
+        print(f"   {r:>6} {t['spatial'] * 1000:>8.1f}ms {t['separable'] * 1000:>8.1f}ms "
+              f"{t['fft'] * 1000:>8.1f}ms")
+    print(f"\n   SPATIAL_MAX_RADIUS   = {ConvolutionDispatcher.SPATIAL_MAX_RADIUS}")
+    print(f"   SEPARABLE_MAX_RADIUS = {ConvolutionDispatcher.SEPARABLE_MAX_RADIUS}")
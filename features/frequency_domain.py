@@ -14,43 +14,51 @@ class FrequencyDomainAnalysis:
     @staticmethod
     def fourier_transform(image):
         """
-        Perform 2D Fourier Transform on image
+        Perform 2D Fourier Transform on image (float32 / complex64)
         
         Args:
-            image: Input image (grayscale)
+            image: Input image (BGR or grayscale; uint8 or float for chaining)
         
         Returns:
-            fft_result: Complex FFT result
-            magnitude_spectrum: Magnitude spectrum for visualization
-            phase_spectrum: Phase spectrum
+            fft_result: Complex FFT result (complex64, zero frequency centered)
+            magnitude_spectrum: Magnitude spectrum for visualization (float32)
+            phase_spectrum: Phase spectrum (float32)
         """
-        # Convert to grayscale if needed
+        # Convert to grayscale if needed (cvtColor has no float64 path)
+        if image.dtype != np.uint8:
+            image = image.astype(np.float32, copy=False)
         if len(image.shape) == 3:
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         else:
             gray = image
+        gray = gray.astype(np.float32, copy=False)
         
-        # Perform 2D FFT
-        fft_result = np.fft.fft2(gray)
+        # Perform 2D FFT in single precision (half the memory of complex128)
+        fft_result = np.fft.fft2(gray).astype(np.complex64, copy=False)
         
         # Shift zero frequency to center
         fft_shifted = np.fft.fftshift(fft_result)
         
         # Calculate magnitude spectrum (for visualization)
-        magnitude_spectrum = 20 * np.log(np.abs(fft_shifted) + 1)  # Log scale
+        magnitude = np.abs(fft_shifted)
+        magnitude_spectrum = 20 * np.log1p(magnitude)  # Log scale
         
         # Calculate phase spectrum
-        phase_spectrum = np.angle(fft_shifted)
+        phase_spectrum = np.angle(fft_shifted).astype(np.float32, copy=False)
         
         return fft_shifted, magnitude_spectrum, phase_spectrum
     
     @staticmethod
-    def inverse_fourier_transform(fft_shifted):
+    def inverse_fourier_transform(fft_shifted, output="uint8", normalize=False):
         """
         Perform inverse FFT to reconstruct image
         
         Args:
             fft_shifted: Shifted FFT result
+            output: "uint8" - magnitude, clipped (or stretched) to 0-255
+                    "float" - signed real part as float32, for chaining
+            normalize: With output="uint8", stretch min-max to 0-255
+                       instead of clipping
         
         Returns:
             Reconstructed image
@@ -59,10 +67,19 @@ class FrequencyDomainAnalysis:
         fft_result = np.fft.ifftshift(fft_shifted)
         
         # Inverse FFT
-        image_back = np.fft.ifft2(fft_result)
+        image_back = np.fft.ifft2(fft_result).astype(np.complex64, copy=False)
+        
+        if output == "float":
+            return image_back.real
+        
         image_back = np.abs(image_back)
+        if normalize:
+            lo, hi = float(image_back.min()), float(image_back.max())
+            scale = 255.0 / (hi - lo) if hi > lo else 0.0
+            image_back = (image_back - lo) * scale
         
-        return image_back.astype(np.uint8)
+        # Clip instead of letting astype wrap values above 255
+        return np.clip(np.rint(image_back), 0, 255).astype(np.uint8)
     
     @staticmethod
     def create_filter_mask(shape, filter_type="lowpass", cutoff=30):
@@ -75,27 +92,29 @@ class FrequencyDomainAnalysis:
             cutoff: Cutoff frequency (radius in pixels)
         
         Returns:
-            Filter mask
+            Filter mask (float32)
         """
         rows, cols = shape
         crow, ccol = rows // 2, cols // 2
         
         # Create coordinate grids
-        y, x = np.ogrid[:rows, :cols]
+        y = np.arange(rows, dtype=np.float32)[:, None] - crow
+        x = np.arange(cols, dtype=np.float32)[None, :] - ccol
         
-        # Calculate distance from center
-        distance = np.sqrt((x - ccol)**2 + (y - crow)**2)
+        # Squared distance from center (no sqrt needed for a radius test)
+        distance_sq = x * x + y * y
         
         # Create mask
         if filter_type == "lowpass":
-            mask = (distance <= cutoff).astype(float)
+            mask = (distance_sq <= cutoff * cutoff).astype(np.float32)
         else:  # highpass
-            mask = (distance > cutoff).astype(float)
+            mask = (distance_sq > cutoff * cutoff).astype(np.float32)
         
         return mask
     
     @staticmethod
-    def apply_frequency_filter(image, filter_type="lowpass", cutoff=30):
+    def apply_frequency_filter(image, filter_type="lowpass", cutoff=30,
+                               output="uint8", normalize=False):
         """
         Apply frequency domain filter
         
@@ -103,6 +122,8 @@ class FrequencyDomainAnalysis:
             image: Input image
             filter_type: "lowpass" (blur) or "highpass" (sharpen/edges)
             cutoff: Cutoff frequency
+            output: "uint8" for display, "float" to chain further frequency ops
+            normalize: Stretch to 0-255 instead of clipping (uint8 output)
         
         Returns:
             Filtered image
@@ -115,14 +136,55 @@ class FrequencyDomainAnalysis:
             image.shape[:2], filter_type, cutoff
         )
         
-        # Apply filter
-        fft_filtered = fft_shifted * mask
+        # Apply filter (in place - fft_shifted is a private temporary)
+        fft_shifted *= mask
+        fft_filtered = fft_shifted
         
         # Inverse FFT
-        filtered_image = FrequencyDomainAnalysis.inverse_fourier_transform(fft_filtered)
+        filtered_image = FrequencyDomainAnalysis.inverse_fourier_transform(
+            fft_filtered, output, normalize
+        )
         
         return filtered_image, fft_filtered, mask
     
+    @staticmethod
+    def display_shape(fig, rows, cols):
+        """
+        Largest (height, width) in pixels a single subplot can show
+        
+        Args:
+            fig: matplotlib Figure
+            rows, cols: Subplot grid
+        
+        Returns:
+            (max_height, max_width) bounded by figure size and DPI
+        """
+        width_in, height_in = fig.get_size_inches()
+        return (max(1, int(height_in * fig.dpi / rows)),
+                max(1, int(width_in * fig.dpi / cols)))
+    
+    @staticmethod
+    def downsample_for_display(array, max_shape, interpolation=cv2.INTER_AREA):
+        """
+        Shrink an array so it is no larger than the on-screen subplot
+        
+        Args:
+            array: 2D array (image, spectrum, mask)
+            max_shape: (max_height, max_width) from display_shape()
+            interpolation: INTER_AREA for intensities, INTER_NEAREST for
+                           wrapped values such as phase
+        
+        Returns:
+            float32 array at display resolution (never upscaled)
+        """
+        h, w = array.shape[:2]
+        scale = min(max_shape[0] / h, max_shape[1] / w, 1.0)
+        array = np.asarray(array, dtype=np.float32)
+        if scale >= 1.0:
+            return array
+        new_size = (max(1, int(w * scale)), max(1, int(h * scale)))
+        return cv2.resize(array, new_size, interpolation=interpolation)
+    
     @staticmethod
     def visualize_frequency_analysis(image, title="Frequency Domain Analysis"):
         """
@@ -148,28 +210,32 @@ class FrequencyDomainAnalysis:
         # Create figure with subplots
         fig = Figure(figsize=(12, 8))
         
+        # Only ship display-sized arrays to imshow
+        max_shape = FrequencyDomainAnalysis.display_shape(fig, 2, 2)
+        shrink = FrequencyDomainAnalysis.downsample_for_display
+        
         # Original image
         ax1 = fig.add_subplot(2, 2, 1)
-        ax1.imshow(gray, cmap='gray')
+        ax1.imshow(shrink(gray, max_shape), cmap='gray')
         ax1.set_title('Original Image')
         ax1.axis('off')
         
         # Magnitude spectrum
         ax2 = fig.add_subplot(2, 2, 2)
-        ax2.imshow(magnitude_spectrum, cmap='hot')
+        ax2.imshow(shrink(magnitude_spectrum, max_shape), cmap='hot')
         ax2.set_title('Magnitude Spectrum (Log Scale)')
         ax2.axis('off')
         
-        # Phase spectrum
+        # Phase spectrum (nearest-neighbour: averaging wrapped angles is meaningless)
         ax3 = fig.add_subplot(2, 2, 3)
-        ax3.imshow(phase_spectrum, cmap='hsv')
+        ax3.imshow(shrink(phase_spectrum, max_shape, cv2.INTER_NEAREST), cmap='hsv')
         ax3.set_title('Phase Spectrum')
         ax3.axis('off')
         
         # 1D frequency profile (horizontal center line)
         ax4 = fig.add_subplot(2, 2, 4)
-        center_row = magnitude_spectrum[magnitude_spectrum.shape[0]//2, :]
-        ax4.plot(center_row)
+        x, center_row = FrequencyDomainAnalysis._center_profile(magnitude_spectrum, max_shape[1])
+        ax4.plot(x, center_row)
         ax4.set_title('Frequency Profile (Horizontal)')
         ax4.set_xlabel('Frequency')
         ax4.set_ylabel('Magnitude')
@@ -200,7 +266,7 @@ class FrequencyDomainAnalysis:
         
         # Get magnitude spectrums
         _, original_spectrum, _ = FrequencyDomainAnalysis.fourier_transform(image)
-        filtered_spectrum = 20 * np.log(np.abs(fft_filtered) + 1)
+        filtered_spectrum = 20 * np.log1p(np.abs(fft_filtered))
         
         # Convert to grayscale
         if len(image.shape) == 3:
@@ -211,39 +277,43 @@ class FrequencyDomainAnalysis:
         # Create figure
         fig = Figure(figsize=(12, 8))
         
+        # Only ship display-sized arrays to imshow
+        max_shape = FrequencyDomainAnalysis.display_shape(fig, 2, 3)
+        shrink = FrequencyDomainAnalysis.downsample_for_display
+        
         # Original image
         ax1 = fig.add_subplot(2, 3, 1)
-        ax1.imshow(gray, cmap='gray')
+        ax1.imshow(shrink(gray, max_shape), cmap='gray')
         ax1.set_title('Original Image')
         ax1.axis('off')
         
         # Original spectrum
         ax2 = fig.add_subplot(2, 3, 2)
-        ax2.imshow(original_spectrum, cmap='hot')
+        ax2.imshow(shrink(original_spectrum, max_shape), cmap='hot')
         ax2.set_title('Original Spectrum')
         ax2.axis('off')
         
         # Filter mask
         ax3 = fig.add_subplot(2, 3, 3)
-        ax3.imshow(mask, cmap='gray')
+        ax3.imshow(shrink(mask, max_shape), cmap='gray')
         ax3.set_title(f'{filter_type.title()} Filter\n(Cutoff={cutoff})')
         ax3.axis('off')
         
         # Filtered image
         ax4 = fig.add_subplot(2, 3, 4)
-        ax4.imshow(filtered, cmap='gray')
+        ax4.imshow(shrink(filtered, max_shape), cmap='gray')
         ax4.set_title('Filtered Image')
         ax4.axis('off')
         
         # Filtered spectrum
         ax5 = fig.add_subplot(2, 3, 5)
-        ax5.imshow(filtered_spectrum, cmap='hot')
+        ax5.imshow(shrink(filtered_spectrum, max_shape), cmap='hot')
         ax5.set_title('Filtered Spectrum')
         ax5.axis('off')
         
-        # Difference
+        # Difference (computed at display size, not full resolution)
         ax6 = fig.add_subplot(2, 3, 6)
-        diff = np.abs(gray.astype(float) - filtered.astype(float))
+        diff = np.abs(shrink(gray, max_shape) - shrink(filtered, max_shape))
         ax6.imshow(diff, cmap='hot')
         ax6.set_title('Difference')
         ax6.axis('off')
@@ -253,4 +323,300 @@ class FrequencyDomainAnalysis:
                     fontsize=14, fontweight='bold')
         fig.tight_layout()
         
-        return fig, filtered
\ No newline at end of file
+        return fig, filtered
+    
+    @staticmethod
+    def _center_profile(magnitude_spectrum, max_points):
+        """Horizontal center-row profile, decimated to at most max_points samples"""
+        center_row = magnitude_spectrum[magnitude_spectrum.shape[0]//2, :]
+        step = max(1, int(np.ceil(len(center_row) / max_points)))
+        x = np.arange(0, len(center_row), step)
+        return x, center_row[::step]
+
+
+class FrequencyVisualizer:
+    """
+    Persistent frequency-analysis figure
+    
+    Keeps one Figure and its artists alive and updates them in place, so
+    re-showing the analysis does not rebuild subplots or re-layout the figure.
+    """
+    
+    def __init__(self, figsize=(12, 8)):
+        self.fig = Figure(figsize=figsize)
+        self.max_shape = FrequencyDomainAnalysis.display_shape(self.fig, 2, 2)
+        
+        self.ax_image = self.fig.add_subplot(2, 2, 1)
+        self.ax_magnitude = self.fig.add_subplot(2, 2, 2)
+        self.ax_phase = self.fig.add_subplot(2, 2, 3)
+        self.ax_profile = self.fig.add_subplot(2, 2, 4)
+        
+        for ax, title in ((self.ax_image, 'Original Image'),
+                          (self.ax_magnitude, 'Magnitude Spectrum (Log Scale)'),
+                          (self.ax_phase, 'Phase Spectrum')):
+            ax.set_title(title)
+            ax.axis('off')
+        
+        self.ax_profile.set_title('Frequency Profile (Horizontal)')
+        self.ax_profile.set_xlabel('Frequency')
+        self.ax_profile.set_ylabel('Magnitude')
+        self.ax_profile.grid(True, alpha=0.3)
+        
+        self.image_artist = None
+        self.magnitude_artist = None
+        self.phase_artist = None
+        self.profile_line, = self.ax_profile.plot([], [])
+        self.suptitle = self.fig.suptitle("", fontsize=14, fontweight='bold')
+        self._laid_out = False
+    
+    def update(self, image, title="Frequency Domain Analysis"):
+        """
+        Recompute the spectra for image and refresh the artists in place
+        
+        Args:
+            image: Input image (BGR or grayscale)
+            title: Figure title
+        
+        Returns:
+            The persistent matplotlib Figure
+        """
+        _, magnitude_spectrum, phase_spectrum = \
+            FrequencyDomainAnalysis.fourier_transform(image)
+        
+        if len(image.shape) == 3:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = image
+        
+        shrink = FrequencyDomainAnalysis.downsample_for_display
+        gray_small = shrink(gray, self.max_shape)
+        magnitude_small = shrink(magnitude_spectrum, self.max_shape)
+        phase_small = shrink(phase_spectrum, self.max_shape, cv2.INTER_NEAREST)
+        
+        self.image_artist = self._set_image(
+            self.ax_image, self.image_artist, gray_small, 'gray', (0, 255))
+        self.magnitude_artist = self._set_image(
+            self.ax_magnitude, self.magnitude_artist, magnitude_small, 'hot',
+            (float(magnitude_small.min()), float(magnitude_small.max())))
+        self.phase_artist = self._set_image(
+            self.ax_phase, self.phase_artist, phase_small, 'hsv', (-np.pi, np.pi))
+        
+        x, center_row = FrequencyDomainAnalysis._center_profile(
+            magnitude_spectrum, self.max_shape[1])
+        self.profile_line.set_data(x, center_row)
+        self.ax_profile.relim()
+        self.ax_profile.autoscale_view()
+        
+        self.suptitle.set_text(title)
+        if not self._laid_out:
+            self.fig.tight_layout()
+            self._laid_out = True
+        
+        return self.fig
+    
+    @staticmethod
+    def _set_image(ax, artist, data, cmap, clim):
+        """Create the AxesImage on first use, otherwise swap its data"""
+        if artist is None:
+            return ax.imshow(data, cmap=cmap, vmin=clim[0], vmax=clim[1])
+        
+        h, w = data.shape[:2]
+        artist.set_data(data)
+        artist.set_clim(*clim)
+        artist.set_extent((-0.5, w - 0.5, h - 0.5, -0.5))
+        return artist
+
+
+class FrequencyEnhancement:
+    """
+    Frequency-domain enhancement operators sharing one cached forward transform
+    
+    The image is transformed once (float32, reflect-padded to an optimal DFT
+    size). High-boost/unsharp, Wiener deconvolution and any product of their
+    transfer functions are then a single multiply + inverse transform, so
+    stacking operators never re-runs the forward FFT or re-quantizes.
+    
+    Usage:
+        enhancer = FrequencyEnhancement(image)
+        sharp = enhancer.high_boost(cutoff=40, amount=1.5)
+        restored = enhancer.apply([enhancer.wiener_transfer(psf, 0.01),
+                                   enhancer.high_boost_transfer(60, 0.5)])
+    """
+    
+    def __init__(self, image, pad=16):
+        """
+        Args:
+            image: Input image (grayscale or BGR, any numeric dtype)
+            pad: Reflect padding (pixels) to suppress wrap-around at borders
+        """
+        self.image = image
+        self.rows, self.cols = image.shape[:2]
+        self.pad = pad
+        
+        padded_h = cv2.getOptimalDFTSize(self.rows + 2 * pad)
+        padded_w = cv2.getOptimalDFTSize(self.cols + 2 * pad)
+        self.fft_shape = (padded_h, padded_w)
+        
+        self._spectrum = None
+        self._log_spectrum = None
+        self._distance_sq = None
+    
+    # ---- Cached transforms ----
+    
+    def _pad(self, plane):
+        """Reflect-pad to the optimal DFT size (image sits at offset pad, pad)"""
+        fh, fw = self.fft_shape
+        return cv2.copyMakeBorder(plane, self.pad, fh - self.rows - self.pad,
+                                  self.pad, fw - self.cols - self.pad,
+                                  cv2.BORDER_REFLECT_101)
+    
+    @property
+    def spectrum(self):
+        """Forward rfft2 of the image (computed once)"""
+        if self._spectrum is None:
+            padded = self._pad(self.image.astype(np.float32))
+            self._spectrum = np.fft.rfft2(padded, axes=(0, 1))
+        return self._spectrum
+    
+    @property
+    def log_spectrum(self):
+        """Forward rfft2 of log(1 + image), used by homomorphic filtering"""
+        if self._log_spectrum is None:
+            padded = self._pad(np.log1p(self.image.astype(np.float32)))
+            self._log_spectrum = np.fft.rfft2(padded, axes=(0, 1))
+        return self._log_spectrum
+    
+    @property
+    def distance_sq(self):
+        """
+        Squared distance from DC for every rfft2 bin
+        
+        Measured in the same units as create_filter_mask (frequency samples of
+        the unpadded image), so cutoff values are interchangeable.
+        """
+        if self._distance_sq is None:
+            fh, fw = self.fft_shape
+            u = np.fft.fftfreq(fh).astype(np.float32)[:, None] * self.rows
+            v = np.fft.rfftfreq(fw).astype(np.float32)[None, :] * self.cols
+            self._distance_sq = u * u + v * v
+        return self._distance_sq
+    
+    # ---- Transfer functions ----
+    
+    def lowpass_transfer(self, cutoff=30):
+        """Gaussian low-pass H(u, v) = exp(-D^2 / 2 cutoff^2)"""
+        return np.exp(-self.distance_sq / (2.0 * cutoff * cutoff))
+    
+    def high_boost_transfer(self, cutoff=30, amount=1.0):
+        """High-boost / unsharp mask H = 1 + amount * (1 - lowpass)"""
+        return 1.0 + amount * (1.0 - self.lowpass_transfer(cutoff))
+    
+    def wiener_transfer(self, psf, noise_ratio=0.01):
+        """
+        Wiener deconvolution H = conj(P) / (|P|^2 + K)
+        
+        Args:
+            psf: Point spread function (2D, centered)
+            noise_ratio: K, noise-to-signal power ratio (higher = smoother)
+        """
+        psf = np.asarray(psf, dtype=np.float32)
+        psf = psf / psf.sum()
+        
+        # Place PSF center at the origin so deconvolution does not shift the image
+        kh, kw = psf.shape
+        psf_padded = np.zeros(self.fft_shape, dtype=np.float32)
+        psf_padded[:kh, :kw] = psf
+        psf_padded = np.roll(psf_padded, (-(kh // 2), -(kw // 2)), axis=(0, 1))
+        
+        P = np.fft.rfft2(psf_padded)
+        return np.conj(P) / (np.abs(P) ** 2 + noise_ratio)
+    
+    # ---- Operators ----
+    
+    def apply(self, transfers, output="uint8", normalize=False):
+        """
+        Multiply the cached spectrum by one or more transfer functions
+        and invert once
+        
+        Args:
+            transfers: Transfer function or list of them (combined by product)
+            output: "uint8" (rounded + clipped) or "float" (float32, signed)
+            normalize: Stretch result to 0-255 instead of clipping
+        
+        Returns:
+            Enhanced image
+        """
+        if not isinstance(transfers, (list, tuple)):
+            transfers = [transfers]
+        
+        H = transfers[0]
+        for transfer in transfers[1:]:
+            H = H * transfer
+        
+        return self._inverse(self.spectrum, H, output, normalize)
+    
+    def high_boost(self, cutoff=30, amount=1.0, output="uint8"):
+        """
+        Frequency-domain unsharp masking
+        
+        Args:
+            cutoff: Gaussian low-pass cutoff defining "detail"
+            amount: Detail gain (0 = no change, 1 = classic unsharp mask)
+            output: "uint8" or "float"
+        """
+        return self.apply(self.high_boost_transfer(cutoff, amount), output)
+    
+    def wiener_deconvolution(self, psf, noise_ratio=0.01, output="uint8"):
+        """
+        Restore an image blurred by a known PSF
+        
+        Args:
+            psf: Point spread function (e.g. motion or defocus kernel)
+            noise_ratio: Regularization K (0.001 - 0.1)
+            output: "uint8" or "float"
+        """
+        return self.apply(self.wiener_transfer(psf, noise_ratio), output)
+    
+    def homomorphic(self, cutoff=30, gamma_low=0.5, gamma_high=1.5, sharpness=1.0,
+                    output="uint8"):
+        """
+        Homomorphic filtering for uneven illumination
+        
+        Compresses low frequencies (illumination) and boosts high frequencies
+        (reflectance) in the log domain, then stretches back to 0-255.
+        
+        Args:
+            cutoff: Illumination / reflectance boundary
+            gamma_low: Gain for low frequencies (< 1 flattens lighting)
+            gamma_high: Gain for high frequencies (> 1 boosts detail)
+            sharpness: Steepness of the transition
+            output: "uint8" or "float"
+        """
+        H = (gamma_high - gamma_low) * \
+            (1.0 - np.exp(-sharpness * self.distance_sq / (2.0 * cutoff * cutoff))) + gamma_low
+        
+        log_result = self._inverse(self.log_spectrum, H, "float", False)
+        result = np.expm1(log_result)
+        return FrequencyEnhancement._finish(result, output, normalize=True)
+    
+    # ---- Helpers ----
+    
+    def _inverse(self, spectrum, H, output, normalize):
+        """Apply H, invert, crop the padding away and convert the result"""
+        if spectrum.ndim == 3 and np.ndim(H) == 2:
+            H = H[:, :, None]
+        result = np.fft.irfft2(spectrum * H, s=self.fft_shape, axes=(0, 1))
+        result = result[self.pad:self.pad + self.rows, self.pad:self.pad + self.cols]
+        return FrequencyEnhancement._finish(result, output, normalize)
+    
+    @staticmethod
+    def _finish(result, output="uint8", normalize=False):
+        """Normalize or clip a float result instead of truncating it"""
+        result = result.astype(np.float32)
+        if normalize:
+            lo, hi = float(result.min()), float(result.max())
+            scale = 255.0 / (hi - lo) if hi > lo else 0.0
+            result = (result - lo) * scale
+        if output == "float":
+            return result
+        return np.clip(np.rint(result), 0, 255).astype(np.uint8)
@@ -0,0 +1,136 @@
+# File: features/hue_saturation.py
+# Deskripsi: Engine hue/saturation/vibrance - rotasi hue lewat tabel 180 entri
+#            dengan wraparound, LUT saturasi pada plane uint8, penyesuaian
+#            selektif per rentang hue, dan satu kali konversi HSV per panggilan
+
+import cv2
+import numpy as np
+
+from features.image_cache import ImageCache
+
+
+class HueSaturation:
+    """
+    Hue, saturation and vibrance adjustments on 8-bit HSV
+
+    OpenCV's 8-bit hue runs 0-179 (2 degrees per step), so hue shifts are a
+    rotation table modulo 180 rather than a clamp. Global adjustments
+    compile to one (256, 1, 3) table and run as a single cv2.LUT over the
+    HSV image (no split/merge); per-hue saturation needs a 180 x 256 table
+    indexed by (hue, saturation).
+
+    Hue shifts are in OpenCV units (-179..179), saturation is additive
+    (-255..255) followed by a multiplicative scale, vibrance is -100..100.
+
+    Usage:
+        result = HueSaturation.adjust(image, hue=10, saturation=20, vibrance=30)
+        result = HueSaturation.adjust(image, ranges={"blue": {"saturation": -40}})
+    """
+
+    HUE_LEVELS = 180
+
+    # Centers of the selective ranges in OpenCV hue units
+    HUE_RANGES = {
+        "red": 0,
+        "yellow": 30,
+        "green": 60,
+        "cyan": 90,
+        "blue": 120,
+        "magenta": 150,
+    }
+
+    # Full width of a selective range (cosine falloff to the neighbours' centers)
+    RANGE_WIDTH = 60
+
+    @staticmethod
+    def saturation_curve(saturation=0, scale=1.0, vibrance=0):
+        """
+        Saturation mapping for levels 0-255 as float64
+
+        vibrance boosts muted colors more than saturated ones
+        (s + v * s * (1 - s / 255)), so grays and saturated colors barely move.
+        """
+        s = np.arange(256, dtype=np.float64)
+        s = (s + saturation) * scale
+        s = np.clip(s, 0.0, 255.0)
+        if vibrance:
+            s = s + (vibrance / 100.0) * s * (1.0 - s / 255.0)
+        return np.clip(s, 0.0, 255.0)
+
+    @staticmethod
+    def range_weights(center, width=None):
+        """Weight 0-1 of every hue (180 entries) for a range around center, with wraparound"""
+        width = width or HueSaturation.RANGE_WIDTH
+        hues = np.arange(HueSaturation.HUE_LEVELS, dtype=np.float64)
+        distance = np.abs((hues - center + 90) % HueSaturation.HUE_LEVELS - 90)
+        return np.where(distance < width / 2.0, 0.5 + 0.5 * np.cos(np.pi * distance / (width / 2.0)), 0.0)
+
+    @staticmethod
+    def _resolve_range(name):
+        """Range name or hue center -> center in OpenCV units"""
+        if isinstance(name, str):
+            if name not in HueSaturation.HUE_RANGES:
+                raise ValueError(f"Hue range must be a number or one of {', '.join(HueSaturation.HUE_RANGES)}")
+            return HueSaturation.HUE_RANGES[name]
+        return float(name)
+
+    @staticmethod
+    def compile(hue=0, saturation=0, scale=1.0, vibrance=0, ranges=None):
+        """
+        Compile adjustments to lookup tables
+
+        Args:
+            ranges: Optional {range: {"hue": shift, "saturation": amount}},
+                where range is a HUE_RANGES name or a hue center (0-179).
+                Selective saturation is additive and weighted by the range.
+
+        Returns:
+            (hsv_lut, sat_table) - (256, 1, 3) table for the HSV image, and a
+            (180, 256) hue-dependent saturation table or None when the
+            saturation does not depend on hue
+        """
+        hue_shift = np.full(HueSaturation.HUE_LEVELS, float(hue))
+        sat_offset = np.zeros(HueSaturation.HUE_LEVELS)
+        for name, params in (ranges or {}).items():
+            weights = HueSaturation.range_weights(HueSaturation._resolve_range(name))
+            hue_shift += weights * params.get("hue", 0)
+            sat_offset += weights * params.get("saturation", 0)
+
+        # Hue stays a 1D table even per range: the shift depends only on hue
+        levels = np.arange(HueSaturation.HUE_LEVELS)
+        hue_lut = np.arange(256, dtype=np.uint8)
+        hue_lut[:HueSaturation.HUE_LEVELS] = (levels + np.rint(hue_shift).astype(np.int32)) % HueSaturation.HUE_LEVELS
+
+        curve = HueSaturation.saturation_curve(saturation, scale, vibrance)
+        identity = np.arange(256, dtype=np.uint8)
+        if not np.any(sat_offset):
+            hsv_lut = np.stack((hue_lut, np.rint(curve).astype(np.uint8), identity), axis=1).reshape(256, 1, 3)
+            return hsv_lut, None
+
+        # Selective saturation is applied on top of the global curve
+        sat_table = np.clip(np.rint(curve[None, :] + sat_offset[:, None]), 0, 255).astype(np.uint8)
+        hsv_lut = np.stack((hue_lut, identity, identity), axis=1).reshape(256, 1, 3)
+        return hsv_lut, sat_table
+
+    @staticmethod
+    def apply_hsv(hsv, hsv_lut, sat_table=None):
+        """Apply compiled tables to an 8-bit HSV image (returns new HSV)"""
+        if sat_table is None:
+            return cv2.LUT(hsv, hsv_lut)
+        # Saturation is looked up with the original hue, before rotation
+        saturation = sat_table.ravel()[(hsv[..., 0].astype(np.intp) << 8) | hsv[..., 1]]
+        result = cv2.LUT(hsv, hsv_lut)
+        result[..., 1] = saturation
+        return result
+
+    @staticmethod
+    def adjust(image, hue=0, saturation=0, scale=1.0, vibrance=0, ranges=None):
+        """
+        Hue/saturation/vibrance of a BGR image with one HSV round trip
+
+        The BGR->HSV conversion comes from the image's ImageCache, so slider
+        previews on the same source reuse it.
+        """
+        hsv_lut, sat_table = HueSaturation.compile(hue, saturation, scale, vibrance, ranges)
+        hsv = ImageCache.for_image(image).hsv
+        return cv2.cvtColor(HueSaturation.apply_hsv(hsv, hsv_lut, sat_table), cv2.COLOR_HSV2BGR)
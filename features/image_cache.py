@@ -0,0 +1,281 @@
+# File: features/image_cache.py
+# Deskripsi: Cache representasi turunan per gambar (grayscale, LAB, HSV,
+#            gradient, dll) supaya rangkaian operasi pada gambar yang sama
+#            hanya membayar setiap konversi satu kali
+
+from collections import OrderedDict
+import threading
+import weakref
+
+import cv2
+import numpy as np
+
+
+class ImageCache:
+    """
+    Lazily computed, memoized representations of one image revision
+
+    Entries are built on first use through get(key, factory) and kept until
+    the image changes. Use ImageCache.for_image(array) to share one cache
+    between every function that receives the same array - features/ and
+    gui/filters.py both go through it.
+
+    Cached arrays are read-only; copy before modifying them.
+
+    The cache only holds a weak reference to the image: once the caller
+    drops the array, its cache (and every derived array) goes with it.
+    Derived data is bounded too - at most ENTRY_BYTES_PER_PIXEL bytes per
+    image pixel are kept per cache, least recently used entries are
+    dropped first.
+    Values that share memory with the image (e.g. "gray" of a grayscale
+    image) are returned but not stored, so they cannot pin the image.
+
+    Only top-level images are registered in the shared LRU. Arrays that are
+    themselves cached entries (planes, cache.gray, samples, ...) get a child
+    cache attached to their owner, so measuring a plane never evicts a
+    working image. Use lookup() to reuse a cache without registering.
+
+    Note: caches are keyed on the array object, not its pixels. Code that
+    edits an array in place must call touch() (or ImageCache.invalidate(array))
+    afterwards; update(new_array) swaps in a new image and re-keys the shared
+    registry.
+    """
+
+    # Number of images whose caches are kept alive at once
+    MAX_SHARED = 4
+    # Derived bytes kept per cache and image pixel (float64 integral +
+    # squared integral = 16, plus two float32 mean/std pairs)
+    ENTRY_BYTES_PER_PIXEL = 32
+    _shared = OrderedDict()
+    # Guards _shared (caches are used from TileExecutor worker threads)
+    _registry_lock = threading.RLock()
+
+    def __init__(self, image):
+        self._ref = weakref.ref(image)
+        self._pixels = image.shape[0] * image.shape[1]
+        self._entries = OrderedDict()
+        self._sizes = {}
+        # Caches of arrays stored in _entries, keyed like the entry
+        self._children = {}
+        self._lock = threading.RLock()
+
+    @property
+    def image(self):
+        """The wrapped array (None once it was garbage collected)"""
+        return self._ref()
+
+    @staticmethod
+    def _nbytes(value):
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, (tuple, list)):
+            return sum(ImageCache._nbytes(item) for item in value)
+        return 0
+
+    def get(self, key, factory):
+        """
+        Return the cached value for key, computing it with factory() if missing
+
+        Args:
+            key: Hashable identifier, e.g. ("gradients", "sobel")
+            factory: Zero-argument callable producing the value
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        # Computed outside the lock so other threads can read meanwhile
+        value = factory()
+        image = self.image
+        if isinstance(value, np.ndarray) and image is not None and np.may_share_memory(value, image):
+            return value
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = self._freeze(value)
+                self._sizes[key] = self._nbytes(value)
+                self._trim(key)
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def _trim(self, keep):
+        """Drop least recently used entries until the derived data fits the budget"""
+        budget = self.ENTRY_BYTES_PER_PIXEL * self._pixels
+        total = sum(self._sizes.values())
+        for key in list(self._entries):
+            if total <= budget:
+                break
+            if key == keep:
+                continue
+            total -= self._sizes.pop(key)
+            del self._entries[key]
+            self._drop_children(key)
+
+    def _drop_children(self, key):
+        for child_key in [k for k in self._children if k[0] == key]:
+            del self._children[child_key]
+
+    def _child_for(self, array):
+        """Cache attached to array if it is one of this cache's entries (searched recursively)"""
+        with self._lock:
+            for key, value in self._entries.items():
+                members = value if isinstance(value, tuple) else (value,)
+                for index, member in enumerate(members):
+                    if member is array:
+                        child = self._children.get((key, index))
+                        if child is None:
+                            child = self._children[(key, index)] = ImageCache(array)
+                        return child
+            children = list(self._children.values())
+        for child in children:
+            found = child._child_for(array)
+            if found is not None:
+                return found
+        return None
+
+    def discard(self, key):
+        """Drop one entry (no-op if missing)"""
+        with self._lock:
+            if key in self._entries:
+                del self._entries[key]
+                del self._sizes[key]
+                self._drop_children(key)
+
+    def clear(self):
+        """Drop every cached representation"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._children.clear()
+
+    def update(self, image):
+        """Replace the wrapped image with a new one (the shared registry follows)"""
+        with ImageCache._registry_lock:
+            old = self.image
+            if old is not None:
+                entry = ImageCache._shared.get(id(old))
+                if entry is not None and entry[1] is self:
+                    del ImageCache._shared[id(old)]
+                    ImageCache._register(image, self)
+            self._ref = weakref.ref(image)
+            self._pixels = image.shape[0] * image.shape[1]
+        self.touch()
+
+    def touch(self):
+        """Mark the wrapped image as modified in place"""
+        self.clear()
+
+    def _freeze(self, value):
+        """Make derived arrays read-only so consumers cannot corrupt the cache"""
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+        elif isinstance(value, tuple):
+            for item in value:
+                self._freeze(item)
+        return value
+
+    # ---- Color-space representations ----
+
+    @property
+    def gray(self):
+        """Single-channel uint8 grayscale"""
+        image = self.image
+        if len(image.shape) == 2:
+            return image
+        return self.get("gray", lambda: cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+
+    @property
+    def lab(self):
+        """8-bit LAB (L, a, b all 0-255, 128 = neutral)"""
+        return self.get("lab", lambda: cv2.cvtColor(self.image, cv2.COLOR_BGR2LAB))
+
+    @property
+    def hsv(self):
+        """8-bit HSV (H 0-179)"""
+        return self.get("hsv", lambda: cv2.cvtColor(self.image, cv2.COLOR_BGR2HSV))
+
+    @property
+    def ycrcb(self):
+        """8-bit YCrCb"""
+        return self.get("ycrcb", lambda: cv2.cvtColor(self.image, cv2.COLOR_BGR2YCrCb))
+
+    def plane(self, space, index):
+        """
+        Single channel of a cached color space, e.g. plane("lab", 0) for L
+
+        The split is cached too, so repeated access costs nothing.
+        """
+        return self.get((space, index), lambda: np.ascontiguousarray(getattr(self, space)[:, :, index]))
+
+    # ---- Shared registry ----
+
+    @staticmethod
+    def lookup(image):
+        """Existing shared or child cache of an array, or None (never registers)"""
+        if isinstance(image, ImageCache):
+            return image
+        with ImageCache._registry_lock:
+            entry = ImageCache._shared.get(id(image))
+            if entry is not None and entry[0]() is image:
+                ImageCache._shared.move_to_end(id(image))
+                return entry[1]
+            owners = [cache for _, cache in ImageCache._shared.values()]
+        for owner in owners:
+            child = owner._child_for(image)
+            if child is not None:
+                return child
+        return None
+
+    @staticmethod
+    def for_image(image):
+        """
+        Shared cache for an image array (or the cache itself if one is passed)
+
+        Arrays cached by another image (planes, gray, samples) get a child
+        cache of their owner; other arrays are registered as top-level
+        images. The last MAX_SHARED images are remembered; an entry also
+        disappears as soon as its array is garbage collected.
+        """
+        with ImageCache._registry_lock:
+            cache = ImageCache.lookup(image)
+            if cache is None:
+                cache = ImageCache._register(image, ImageCache(image))
+            return cache
+
+    @staticmethod
+    def _register(image, cache):
+        """Add a top-level image to the shared LRU (caller holds the registry lock)"""
+        key = id(image)
+        ImageCache._shared[key] = (weakref.ref(image, ImageCache._make_cleanup(key)), cache)
+        while len(ImageCache._shared) > ImageCache.MAX_SHARED:
+            ImageCache._shared.popitem(last=False)
+        return cache
+
+    @staticmethod
+    def invalidate(image):
+        """Forget the shared cache of an array after it was modified in place"""
+        if isinstance(image, ImageCache):
+            image.clear()
+            return
+        with ImageCache._registry_lock:
+            entry = ImageCache._shared.pop(id(image), None)
+        if entry is not None:
+            entry[1].clear()
+
+    @staticmethod
+    def _make_cleanup(key):
+        """Weakref callback removing a dead array's cache"""
+        def cleanup(ref):
+            # Runs inside garbage collection, possibly while this thread holds
+            # a cache lock: never block. A skipped dead entry is harmless (its
+            # weakref no longer matches) and ages out of the LRU.
+            if not ImageCache._registry_lock.acquire(blocking=False):
+                return
+            try:
+                entry = ImageCache._shared.get(key)
+                if entry is not None and entry[0] is ref:
+                    del ImageCache._shared[key]
+            finally:
+                ImageCache._registry_lock.release()
+        return cleanup
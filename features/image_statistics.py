@@ -0,0 +1,131 @@
+# File: features/image_statistics.py
+# Deskripsi: Estimasi statistik gambar (histogram, mean, persentil, clipping)
+#            dari subsample terstratifikasi - resolusi penuh hanya dipakai
+#            untuk menerapkan koreksi, bukan untuk mengukurnya
+
+import numpy as np
+
+from features.image_cache import ImageCache
+
+
+class ImageStatistics:
+    """
+    Statistics estimated from a stratified subsample
+
+    The image is divided into a grid of step x step cells and one pixel is
+    taken from a (deterministic) random position in every cell. That keeps
+    spatial coverage uniform like a strided grid, without aliasing against
+    periodic patterns. Samples are cached per image (see ImageCache), so
+    several measurements on the same image share one gather. Planes and
+    other derived arrays keep their samples in their owner's cache instead
+    of taking a slot in the shared LRU.
+
+    accuracy controls the speed/accuracy trade-off:
+        "fast" (~65k samples), "balanced" (~262k), "exact" (every pixel),
+        or an int giving the sample budget directly.
+    Images that already fit in the budget are measured exactly.
+    """
+
+    ACCURACY = {"fast": 65_536, "balanced": 262_144, "exact": None}
+
+    # Fixed seed so repeated measurements of an image agree
+    SEED = 12345
+
+    @staticmethod
+    def sample_budget(accuracy):
+        """Number of samples for an accuracy setting (None = all pixels)"""
+        if isinstance(accuracy, str):
+            if accuracy not in ImageStatistics.ACCURACY:
+                raise ValueError(f"Accuracy must be an int or one of {', '.join(ImageStatistics.ACCURACY)}")
+            return ImageStatistics.ACCURACY[accuracy]
+        return None if accuracy is None else max(1, int(accuracy))
+
+    @staticmethod
+    def sample(image, accuracy="balanced"):
+        """
+        Stratified subsample, shaped like a small image ((rows, cols) or (rows, cols, C))
+
+        Returns the image itself when it fits in the sample budget.
+        """
+        budget = ImageStatistics.sample_budget(accuracy)
+        cache = ImageCache.for_image(image)
+        image = cache.image
+        h, w = image.shape[:2]
+        if budget is None or h * w <= budget:
+            return image
+
+        def gather():
+            step = int(np.ceil(np.sqrt(h * w / budget)))
+            rows, cols = h // step, w // step
+            rng = np.random.default_rng(ImageStatistics.SEED)
+            ys = np.arange(rows)[:, None] * step + rng.integers(0, step, size=(rows, cols))
+            xs = np.arange(cols)[None, :] * step + rng.integers(0, step, size=(rows, cols))
+            return image[ys, xs]
+
+        return cache.get(("stats_sample", budget), gather)
+
+    @staticmethod
+    def _pixels(image, accuracy):
+        """Sample flattened to (n, channels)"""
+        samples = ImageStatistics.sample(image, accuracy)
+        channels = samples.shape[2] if samples.ndim == 3 else 1
+        return samples.reshape(-1, channels), image.shape[0] * image.shape[1]
+
+    @staticmethod
+    def histogram(image, channel=0, accuracy="balanced", normalize=False):
+        """
+        256-bin histogram of one channel of a uint8 image
+
+        Args:
+            normalize: If True returns fractions; otherwise counts scaled to
+                the full image's pixel count (comparable with cv2.calcHist)
+        """
+        pixels, total = ImageStatistics._pixels(image, accuracy)
+        hist = np.bincount(pixels[:, channel], minlength=256).astype(np.float64)
+        hist /= len(pixels)
+        return hist if normalize else hist * total
+
+    @staticmethod
+    def channel_means(image, accuracy="balanced"):
+        """Mean of every channel (array of length C)"""
+        pixels, _ = ImageStatistics._pixels(image, accuracy)
+        return pixels.mean(axis=0, dtype=np.float64)
+
+    @staticmethod
+    def percentiles(image, q, accuracy="balanced"):
+        """
+        Per-channel percentiles
+
+        Args:
+            q: Percentile or sequence of percentiles (0-100)
+
+        Returns:
+            Array of shape (len(q), C) (or (C,) for a scalar q)
+        """
+        pixels, _ = ImageStatistics._pixels(image, accuracy)
+        return np.percentile(pixels, q, axis=0)
+
+    @staticmethod
+    def clipping_ratio(image, low=0, high=255, accuracy="balanced"):
+        """
+        Fraction of pixels at or beyond the ends of the range, per channel
+
+        Returns:
+            (shadows, highlights) arrays of length C
+        """
+        pixels, _ = ImageStatistics._pixels(image, accuracy)
+        return (pixels <= low).mean(axis=0), (pixels >= high).mean(axis=0)
+
+    @staticmethod
+    def summary(image, accuracy="balanced"):
+        """Means, median, 1st/99th percentiles and clipping ratios in one dict"""
+        low, median, high = ImageStatistics.percentiles(image, (1, 50, 99), accuracy)
+        shadows, highlights = ImageStatistics.clipping_ratio(image, accuracy=accuracy)
+        return {
+            "mean": ImageStatistics.channel_means(image, accuracy),
+            "median": median,
+            "p1": low,
+            "p99": high,
+            "shadow_clipping": shadows,
+            "highlight_clipping": highlights,
+        }
@@ -0,0 +1,240 @@
+# File: features/operations.py
+# Deskripsi: Registry operasi filter - satu implementasi per filter beserta
+#            deskripsinya (parameter, radius kernel, separable, in-place,
+#            dtype) dan normalisasi ukuran kernel ganjil, supaya tiling,
+#            cache, dan GUI memakai jalur yang sama
+
+import inspect
+
+import cv2
+import numpy as np
+
+from features.convolution import ConvolutionDispatcher
+from features.denoise import Denoiser
+from features.image_cache import ImageCache
+from features.sharpen import Sharpener
+from features.tiling import TileExecutor
+
+
+class Operation:
+    """
+    Description of one image operation
+
+    Attributes:
+        name: Registry key
+        function: Callable(image, **params) returning a new image
+        params: Parameter names and their defaults
+        radius: Callable(params) -> neighbourhood radius in pixels (the halo
+            a tile needs so tiled output matches whole-image output)
+        separable: True if the operation runs as row + column passes
+        in_place: True if function writes its result into the input array
+            (the built-in operations all return a new array)
+        dtypes: Supported input dtypes (names)
+        kernel_params: Parameters that are odd kernel sizes
+        align: Optional callable(params) -> tile row alignment (subsampled ops)
+    """
+
+    def __init__(self, name, function, params, radius, separable=False, in_place=False,
+                 dtypes=("uint8",), kernel_params=(), align=None, description=""):
+        self.name = name
+        self.function = function
+        self.params = dict(params)
+        self.radius = radius
+        self.separable = separable
+        self.in_place = in_place
+        self.dtypes = tuple(dtypes)
+        self.kernel_params = tuple(kernel_params)
+        self.align = align
+        self.description = description
+
+    def resolve(self, params, strict=False):
+        """
+        Defaults merged with params, kernel sizes normalized
+
+        Raises:
+            ValueError: Unknown parameter, or an invalid kernel size
+        """
+        unknown = set(params) - set(self.params)
+        if unknown:
+            raise ValueError(f"Unknown parameter(s) for {self.name}: {', '.join(sorted(unknown))}")
+        resolved = {**self.params, **params}
+        for key in self.kernel_params:
+            resolved[key] = OperationRegistry.normalize_kernel_size(resolved[key], strict)
+        return resolved
+
+    def halo(self, params):
+        """Neighbourhood radius for resolved params"""
+        return int(self.radius(params))
+
+    def supports(self, dtype):
+        return np.dtype(dtype).name in self.dtypes
+
+    def describe(self):
+        """Plain dict summary (for GUIs, schedulers, docs)"""
+        return {
+            "name": self.name,
+            "params": dict(self.params),
+            "separable": self.separable,
+            "in_place": self.in_place,
+            "dtypes": self.dtypes,
+            "kernel_params": self.kernel_params,
+            "description": self.description,
+        }
+
+
+class OperationRegistry:
+    """
+    Registry of filter operations
+
+    Every blur has one implementation here; color_enhancement's apply_*_blur
+    helpers (lenient: even kernel sizes are bumped to the next odd size and
+    0 becomes 1) and LinearFilters / NonLinearFilters (strict: even or
+    non-positive sizes raise ValueError) both go through apply().
+
+    Usage:
+        OperationRegistry.apply("gaussian_blur", image, kernel_size=7)
+        OperationRegistry.get("median_blur").halo({"kernel_size": 5})   # 2
+        OperationRegistry.apply("bilateral", image, workers=4)        # tiled
+    """
+
+    _operations = {}
+
+    @staticmethod
+    def normalize_kernel_size(size, strict=False):
+        """
+        Odd, positive kernel size
+
+        Args:
+            size: Requested size
+            strict: Raise on even or non-positive sizes instead of rounding up
+                to the next odd size (sizes below 1 become 1, as the GUI
+                sliders' 0 always did)
+
+        Raises:
+            ValueError: With strict=True, size < 1 or even
+        """
+        size = int(size)
+        if strict and (size < 1 or size % 2 == 0):
+            raise ValueError("Kernel size must be odd and positive")
+        size = max(1, size)
+        return size if size % 2 else size + 1
+
+    @staticmethod
+    def register(operation):
+        """Add (or replace) an operation; returns it"""
+        OperationRegistry._operations[operation.name] = operation
+        return operation
+
+    @staticmethod
+    def get(name):
+        if name not in OperationRegistry._operations:
+            raise ValueError(f"Unknown operation: {name}")
+        return OperationRegistry._operations[name]
+
+    @staticmethod
+    def names():
+        return list(OperationRegistry._operations)
+
+    @staticmethod
+    def apply(name, image, strict=False, workers=1, cache=False, **params):
+        """
+        Run a registered operation
+
+        Args:
+            name: Operation name
+            image: Input image
+            strict: Reject even or non-positive kernel sizes instead of bumping them
+            workers: Parallel bands through TileExecutor (1 = whole image,
+                None = all cores); the halo comes from the operation's radius
+            cache: Memoize the result in the image's ImageCache (the
+                returned array is then read-only)
+            params: Operation parameters
+
+        Raises:
+            ValueError: Unknown operation/parameter, bad kernel size or dtype
+        """
+        operation = OperationRegistry.get(name)
+        params = operation.resolve(params, strict)
+        if not operation.supports(image.dtype):
+            raise ValueError(f"{name} does not support {image.dtype} images "
+                             f"(supported: {', '.join(operation.dtypes)})")
+
+        def run():
+            if workers == 1:
+                return operation.function(image, **params)
+            align = operation.align(params) if operation.align else 1
+            return TileExecutor.apply(image, lambda band: operation.function(band, **params),
+                                      operation.halo(params), workers=workers, align=align)
+
+        if not cache:
+            return run()
+        key = ("operation", name) + tuple(sorted(params.items()))
+        return ImageCache.for_image(image).get(key, run)
+
+
+# ---- Blur implementations ----
+
+def average_blur(image, kernel_size=5):
+    """Box blur"""
+    return cv2.blur(image, (kernel_size, kernel_size))
+
+
+def gaussian_blur(image, kernel_size=5, sigma=0):
+    """Gaussian blur (sigma 0 = derived from kernel_size); FFT for very large kernels"""
+    return ConvolutionDispatcher.gaussian_blur(image, kernel_size, sigma)
+
+
+def median_blur(image, kernel_size=5):
+    """Median blur"""
+    return cv2.medianBlur(image, kernel_size)
+
+
+def _kernel_radius(params):
+    return params["kernel_size"] // 2
+
+
+OperationRegistry.register(Operation(
+    "average_blur", average_blur, {"kernel_size": 5}, _kernel_radius,
+    separable=True, in_place=False, dtypes=("uint8", "uint16", "int16", "float32", "float64"),
+    kernel_params=("kernel_size",), description="Box (mean) blur"))
+
+OperationRegistry.register(Operation(
+    "gaussian_blur", gaussian_blur, {"kernel_size": 5, "sigma": 0}, _kernel_radius,
+    separable=True, in_place=False, dtypes=("uint8", "uint16", "int16", "float32", "float64"),
+    kernel_params=("kernel_size",), description="Gaussian blur"))
+
+# cv2.medianBlur takes uint16/float32 only for kernel sizes 3 and 5
+OperationRegistry.register(Operation(
+    "median_blur", median_blur, {"kernel_size": 5}, _kernel_radius,
+    separable=False, in_place=False, dtypes=("uint8",),
+    kernel_params=("kernel_size",), description="Median blur"))
+
+# ---- Edge-preserving denoise (see features/denoise.py) ----
+
+def _defaults(function):
+    """Keyword defaults of function (everything after the image)"""
+    parameters = list(inspect.signature(function).parameters.values())[1:]
+    return {p.name: p.default for p in parameters}
+
+
+for _method, _function in Denoiser.METHODS.items():
+    _function = getattr(Denoiser, _function)
+    OperationRegistry.register(Operation(
+        _method, _function, {**_defaults(_function), **Denoiser.PRESETS[_method]["balanced"]},
+        lambda params, method=_method: Denoiser.halo(method, params),
+        separable=(_method == "guided"), in_place=False, dtypes=("uint8",),
+        align=lambda params: max(params.get("subsample", 1), params.get("downsample", 1)),
+        description=f"Edge-preserving denoise ({_method})"))
+
+# ---- Sharpening (see features/sharpen.py) ----
+
+OperationRegistry.register(Operation(
+    "unsharp_mask", Sharpener.unsharp_mask, _defaults(Sharpener.unsharp_mask),
+    lambda params: Sharpener.reach(params["radius"], params["blur"]),
+    separable=True, in_place=False, dtypes=("uint8",),
+    description="Unsharp mask (radius, amount, threshold)"))
+
+OperationRegistry.register(Operation(
+    "sharpen", Sharpener.sharpen_3x3, _defaults(Sharpener.sharpen_3x3), lambda params: 1,
+    separable=False, in_place=False, dtypes=("uint8", "uint16", "int16", "float32", "float64"),
+    description="3x3 Laplacian sharpen"))
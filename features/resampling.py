@@ -0,0 +1,136 @@
+# File: features/resampling.py
+# Deskripsi: Resize engine - reduksi besar lewat piramida halving bertingkat lalu
+#            satu langkah akhir berkualitas, interpolasi dipilih otomatis dari skala
+
+import cv2
+import numpy as np
+
+
+class ResizeEngine:
+    """
+    Fast, alias-free resizing
+
+    Large reductions are done by repeated 2x INTER_AREA halvings (exact 2x2
+    box averages, OpenCV's fastest resize path) while the remaining factor
+    is at most 0.5, then one final step to the exact target size. Upscales
+    use a high-quality kernel. The interpolation is chosen from the scale
+    factor unless the caller forces one; only INTER_AREA and INTER_LINEAR
+    are combined with the halvings, any other forced interpolation (e.g.
+    INTER_NEAREST for label maps and masks, which must not be averaged) is
+    one direct cv2.resize.
+
+    Halvings are used instead of cv2.pyrDown: they are 2-3x faster here
+    and keep pixel centers aligned (pyrDown's output pixel i sits at input
+    pixel 2i, which drifts by up to half an output pixel over several levels).
+
+    Usage:
+        thumbnail = ResizeEngine.resize(image, (320, 240))
+    """
+
+    # Halve while the remaining scale is at or below this
+    PYRAMID_THRESHOLD = 0.5
+
+    # Scale changes smaller than this count as "no scaling"
+    SCALE_TOLERANCE = 1e-3
+
+    # Forced interpolations the averaging halvings do not change in kind
+    PYRAMID_INTERPOLATIONS = (cv2.INTER_AREA, cv2.INTER_LINEAR)
+
+    @staticmethod
+    def uses_pyramid(interpolation):
+        """Whether a (possibly forced) interpolation may go through the halvings"""
+        return interpolation is None or interpolation in ResizeEngine.PYRAMID_INTERPOLATIONS
+
+    @staticmethod
+    def choose_interpolation(scale, warp=False):
+        """
+        Interpolation for a scale factor
+        Args:
+            scale: Output / input size ratio
+            warp: True for cv2.warpAffine, which has no INTER_AREA
+        """
+        if scale < 1.0 - ResizeEngine.SCALE_TOLERANCE:
+            # Remaining downscale after the pyramid is < 2x, linear is alias-free enough there
+            return cv2.INTER_LINEAR if warp else cv2.INTER_AREA
+        if scale > 1.0 + ResizeEngine.SCALE_TOLERANCE:
+            return cv2.INTER_LANCZOS4
+        return cv2.INTER_CUBIC
+
+    @staticmethod
+    def pyramid_levels(scale):
+        """Number of halvings that keep the remaining factor above 0.5"""
+        levels = 0
+        while scale * (2 ** levels) <= ResizeEngine.PYRAMID_THRESHOLD:
+            levels += 1
+        return levels
+
+    @staticmethod
+    def halve(image):
+        """
+        One pyramid level: 2x INTER_AREA reduction
+
+        Returns:
+            (halved, step) - the image and the 3x3 matrix mapping its pixel
+            coordinates to the input's (the extent maps exactly onto the input)
+        """
+        h, w = image.shape[:2]
+        new_w, new_h = max(1, w // 2), max(1, h // 2)
+        sx, sy = w / new_w, h / new_h
+        step = np.array([[sx, 0.0, 0.5 * (sx - 1.0)],
+                         [0.0, sy, 0.5 * (sy - 1.0)],
+                         [0.0, 0.0, 1.0]])
+        return cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA), step
+
+    @staticmethod
+    def resize(image, size, interpolation=None):
+        """
+        Resize to size = (width, height)
+        Args:
+            image: Input image
+            size: Target (width, height)
+            interpolation: None picks it from the scale (with halvings);
+                INTER_AREA / INTER_LINEAR are used for the final step after the
+                halvings; anything else is one direct cv2.resize
+        """
+        width, height = int(size[0]), int(size[1])
+        if width <= 0 or height <= 0:
+            raise ValueError("Target width and height must be positive")
+        if not ResizeEngine.uses_pyramid(interpolation):
+            return cv2.resize(image, (width, height), interpolation=interpolation)
+
+        h, w = image.shape[:2]
+        # Pyramid only while both axes still shrink by at least 2x
+        levels = ResizeEngine.pyramid_levels(max(width / w, height / h))
+        for _ in range(levels):
+            image, _ = ResizeEngine.halve(image)
+
+        if levels and image.shape[1] == width and image.shape[0] == height:
+            return image
+        if interpolation is None:
+            h, w = image.shape[:2]
+            interpolation = ResizeEngine.choose_interpolation(min(width / w, height / h))
+        return cv2.resize(image, (width, height), interpolation=interpolation)
+
+    @staticmethod
+    def prefilter_for_warp(image, matrix, interpolation=None):
+        """
+        Pre-shrink the source of a downscaling affine warp
+
+        Args:
+            image: Source image
+            matrix: 3x3 source-to-output matrix
+            interpolation: Warp interpolation; the source is left as is when
+                it is not one uses_pyramid() accepts
+
+        Returns:
+            (image, matrix) - reduced source and the matrix adjusted to its
+            pixel coordinates
+        """
+        if not ResizeEngine.uses_pyramid(interpolation):
+            return image, matrix
+        # Largest singular value = the least-shrunk direction
+        scale = float(np.linalg.svd(matrix[:2, :2], compute_uv=False)[0])
+        for _ in range(ResizeEngine.pyramid_levels(scale)):
+            image, step = ResizeEngine.halve(image)
+            matrix = matrix @ step
+        return image, matrix
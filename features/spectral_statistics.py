@@ -0,0 +1,239 @@
+# File: features/spectral_statistics.py
+# Deskripsi: Statistik spektrum numerik (tanpa matplotlib) untuk QA blur/ketajaman
+#            secara batch - radial power spectrum, rasio energi frekuensi tinggi,
+#            dan Welch-averaged spectrum
+
+import cv2
+import numpy as np
+
+
+class SpectralStatistics:
+    """
+    Headless spectral summaries of an image
+
+    Frequencies are in cycles/pixel (0 = DC, 0.5 = Nyquist), so results from
+    images of different sizes can be compared directly.
+    """
+
+    @staticmethod
+    def to_gray_float(image):
+        """Grayscale float32 copy of image with its mean removed"""
+        if len(image.shape) == 3:
+            if image.dtype != np.uint8:
+                image = image.astype(np.float32)
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        gray = image.astype(np.float32)
+        gray -= gray.mean()
+        return gray
+
+    @staticmethod
+    def hann_window(shape):
+        """2D separable Hann window (float32)"""
+        return cv2.createHanningWindow((shape[1], shape[0]), cv2.CV_32F)
+
+    @staticmethod
+    def power_spectrum(image, window=True):
+        """
+        One-sided 2D power spectrum (rfft2 layout, not shifted)
+
+        Args:
+            image: Input image (BGR or grayscale)
+            window: Apply a Hann window to suppress edge leakage
+
+        Returns:
+            Power spectrum (float32, shape (h, w // 2 + 1))
+        """
+        gray = SpectralStatistics.to_gray_float(image)
+        if window:
+            gray *= SpectralStatistics.hann_window(gray.shape)
+        spectrum = np.fft.rfft2(gray)
+        return (spectrum.real ** 2 + spectrum.imag ** 2).astype(np.float32)
+
+    @staticmethod
+    def _radial_frequency(shape):
+        """
+        Radial frequency of every rfft2 bin and how many full-spectrum bins it stands for
+
+        Interior rfft2 columns represent a conjugate pair, so they count twice.
+        """
+        rows, cols = shape
+        fy = np.fft.fftfreq(rows).astype(np.float32)[:, None]
+        fx = np.fft.rfftfreq(cols).astype(np.float32)[None, :]
+        radius = np.sqrt(fy * fy + fx * fx)
+
+        multiplicity = np.full(fx.shape[1], 2.0, dtype=np.float32)
+        multiplicity[0] = 1.0
+        if cols % 2 == 0:
+            multiplicity[-1] = 1.0
+        return radius, np.broadcast_to(multiplicity, radius.shape)
+
+    @staticmethod
+    def radial_profile(power, full_shape, n_bins=64):
+        """
+        Radially average a one-sided power spectrum
+
+        Args:
+            power: rfft2-layout power spectrum
+            full_shape: (rows, cols) of the spatial data it came from
+            n_bins: Number of radial bins between 0 and Nyquist
+
+        Returns:
+            (frequencies, mean_power) - bin centers in cycles/pixel and
+            the average power in each ring (NaN for empty rings)
+        """
+        radius, multiplicity = SpectralStatistics._radial_frequency(full_shape)
+
+        # Rings beyond Nyquist (the corners) are dropped
+        bins = (radius * (2 * n_bins)).astype(np.int32).ravel()
+        valid = bins < n_bins
+        bins = bins[valid]
+        weights = multiplicity.ravel()[valid]
+
+        totals = np.bincount(bins, weights=(power.ravel()[valid] * weights), minlength=n_bins)
+        counts = np.bincount(bins, weights=weights, minlength=n_bins)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_power = totals / counts
+        frequencies = (np.arange(n_bins) + 0.5) / (2 * n_bins)
+        return frequencies.astype(np.float32), mean_power.astype(np.float32)
+
+    @staticmethod
+    def radial_power_spectrum(image, n_bins=64, window=True):
+        """
+        Radially averaged power spectrum of the whole image
+
+        Args:
+            image: Input image
+            n_bins: Number of radial bins
+            window: Apply a Hann window first
+
+        Returns:
+            (frequencies, mean_power)
+        """
+        power = SpectralStatistics.power_spectrum(image, window)
+        return SpectralStatistics.radial_profile(power, image.shape[:2], n_bins)
+
+    @staticmethod
+    def high_frequency_ratio(image, cutoff=0.25, window=True):
+        """
+        Fraction of (non-DC) spectral energy above a cutoff frequency
+
+        Sharp images typically score well above blurred ones.
+
+        Args:
+            image: Input image
+            cutoff: Cutoff as a fraction of Nyquist (0-1)
+            window: Apply a Hann window first
+
+        Returns:
+            Ratio in [0, 1]
+        """
+        power = SpectralStatistics.power_spectrum(image, window)
+        return SpectralStatistics.energy_ratio(power, image.shape[:2], cutoff)
+
+    @staticmethod
+    def energy_ratio(power, full_shape, cutoff=0.25):
+        """
+        High-frequency energy ratio of an already computed rfft2-layout power spectrum
+
+        Args:
+            power: rfft2-layout power spectrum
+            full_shape: (rows, cols) of the spatial data it came from
+            cutoff: Cutoff as a fraction of Nyquist (0-1)
+        """
+        radius, multiplicity = SpectralStatistics._radial_frequency(full_shape)
+
+        weighted = power * multiplicity
+        weighted[0, 0] = 0.0  # ignore DC
+        total = float(weighted.sum())
+        if total == 0.0:
+            return 0.0
+        return float(weighted[radius > cutoff * 0.5].sum()) / total
+
+    @staticmethod
+    def welch_power_spectrum(image, tile_size=256, overlap=0.5):
+        """
+        Welch-averaged 2D power spectrum over Hann-windowed tiles
+
+        Averaging overlapping tiles trades frequency resolution for a much
+        lower-variance estimate. Tiles are processed one tile-row at a time
+        so memory stays bounded on very large images.
+
+        Args:
+            image: Input image
+            tile_size: Tile edge in pixels (clamped to the image size)
+            overlap: Tile overlap fraction (0 - 0.9)
+
+        Returns:
+            (power, tile_shape) - averaged rfft2-layout power spectrum and the
+            (rows, cols) of a tile, for radial_profile()
+        """
+        if len(image.shape) == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        gray = image.astype(np.float32)
+
+        h, w = gray.shape
+        th, tw = min(tile_size, h), min(tile_size, w)
+        step_y = max(1, int(th * (1.0 - overlap)))
+        step_x = max(1, int(tw * (1.0 - overlap)))
+
+        window = SpectralStatistics.hann_window((th, tw))
+        # Normalize by window energy so the estimate does not depend on the window
+        scale = 1.0 / float((window * window).sum())
+
+        tiles = np.lib.stride_tricks.sliding_window_view(gray, (th, tw))[::step_y, ::step_x]
+        total = np.zeros((th, tw // 2 + 1), dtype=np.float64)
+        count = 0
+
+        for tile_row in tiles:
+            # Detrend each tile (remove its mean) before windowing
+            batch = tile_row - tile_row.mean(axis=(1, 2), keepdims=True)
+            batch *= window
+            spectrum = np.fft.rfft2(batch, axes=(1, 2))
+            total += (spectrum.real ** 2 + spectrum.imag ** 2).sum(axis=0)
+            count += batch.shape[0]
+
+        return (total * (scale / count)).astype(np.float32), (th, tw)
+
+    @staticmethod
+    def welch_radial_profile(image, tile_size=256, overlap=0.5, n_bins=64):
+        """
+        Radial profile of the Welch-averaged spectrum
+
+        Returns:
+            (frequencies, mean_power)
+        """
+        power, tile_shape = SpectralStatistics.welch_power_spectrum(image, tile_size, overlap)
+        return SpectralStatistics.radial_profile(power, tile_shape, n_bins)
+
+    @staticmethod
+    def spectral_slope(frequencies, mean_power, f_min=0.02, f_max=0.4):
+        """
+        Slope of log10(power) vs log10(frequency)
+
+        Natural images sit around -2; blur makes the slope steeper (more negative).
+        """
+        keep = (frequencies >= f_min) & (frequencies <= f_max) & (mean_power > 0)
+        if keep.sum() < 2:
+            return float("nan")
+        slope, _ = np.polyfit(np.log10(frequencies[keep]), np.log10(mean_power[keep]), 1)
+        return float(slope)
+
+    @staticmethod
+    def sharpness_summary(image, tile_size=256, cutoff=0.25, n_bins=64):
+        """
+        Batch QA summary - one call, plain numbers, no figures
+
+        Returns:
+            Dict with high_frequency_ratio, spectral_slope and the
+            Welch radial profile (frequencies, power)
+        """
+        power, tile_shape = SpectralStatistics.welch_power_spectrum(image, tile_size)
+        frequencies, mean_power = SpectralStatistics.radial_profile(power, tile_shape, n_bins)
+
+        return {
+            "high_frequency_ratio": SpectralStatistics.energy_ratio(power, tile_shape, cutoff),
+            "spectral_slope": SpectralStatistics.spectral_slope(frequencies, mean_power),
+            "frequencies": frequencies,
+            "radial_power": mean_power,
+        }
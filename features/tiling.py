@@ -0,0 +1,92 @@
+# File: features/tiling.py
+# Deskripsi: Eksekusi operasi per pita (band) horizontal dengan halo/overlap,
+#            paralel lewat ThreadPoolExecutor - membatasi memori kerja dan
+#            memakai semua core untuk operasi yang tidak paralel sendiri
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+import numpy as np
+
+
+class TileExecutor:
+    """
+    Run a neighbourhood operation band by band
+
+    The image is cut into horizontal bands; each band is processed together
+    with `halo` extra rows above and below, and only its own rows are kept.
+    When halo covers the operation's reach the result equals processing the
+    whole image at once (the image borders are untouched). Bands are
+    contiguous row ranges, so no copies are needed to cut them.
+
+    OpenCV and most NumPy kernels release the GIL, so threads give real
+    parallelism. Operations that OpenCV already parallelizes internally gain
+    mostly the bounded working memory.
+
+    Usage:
+        result = TileExecutor.apply(image, lambda band: cv2.bilateralFilter(band, 9, 40, 6), halo=4)
+    """
+
+    # Rows per band when not given (bands are also capped by the worker count)
+    BAND_ROWS = 256
+
+    @staticmethod
+    def default_workers():
+        return os.cpu_count() or 1
+
+    @staticmethod
+    def _round_up(value, multiple):
+        return -(-value // multiple) * multiple
+
+    @staticmethod
+    def bands(height, band_rows=None, workers=1, align=1):
+        """
+        Split [0, height) into (start, stop) row ranges
+
+        Args:
+            band_rows: Target rows per band (default BAND_ROWS)
+            workers: Number of workers; bands are made small enough to keep
+                every worker busy
+            align: Band starts are multiples of this (for subsampled operations)
+        """
+        band_rows = band_rows or TileExecutor.BAND_ROWS
+        band_rows = min(band_rows, max(1, -(-height // max(1, workers))))
+        band_rows = TileExecutor._round_up(max(1, band_rows), align)
+        return [(start, min(start + band_rows, height)) for start in range(0, height, band_rows)]
+
+    @staticmethod
+    def apply(image, fn, halo, band_rows=None, workers=None, align=1):
+        """
+        Apply fn band by band
+
+        Args:
+            image: Input image
+            fn: Callable mapping an image (band plus halo) to an output of
+                the same height and width
+            halo: Rows of context the operation needs on each side
+            band_rows: Rows per band (default BAND_ROWS)
+            workers: Thread count (None = all cores, 1 = sequential)
+            align: Row alignment of bands and halo (e.g. a subsampling factor)
+
+        Returns:
+            Output assembled from the bands
+        """
+        workers = workers or TileExecutor.default_workers()
+        h = image.shape[0]
+        halo = TileExecutor._round_up(max(0, int(halo)), align)
+        ranges = TileExecutor.bands(h, band_rows, workers, align)
+        if len(ranges) == 1:
+            return fn(image)
+
+        def run(band):
+            start, stop = band
+            top, bottom = max(0, start - halo), min(h, stop + halo)
+            result = fn(image[top:bottom])
+            return result[start - top:start - top + (stop - start)]
+
+        if workers == 1:
+            parts = [run(band) for band in ranges]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(run, ranges))
+        return np.concatenate(parts, axis=0)
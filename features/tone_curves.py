@@ -0,0 +1,184 @@
+# File: features/tone_curves.py
+# Deskripsi: Engine curves & levels - black/white point, midtone, kurva spline
+#            per kanal, dan auto-levels; semua dikompilasi menjadi LUT 256 entri
+#            per kanal dan diterapkan dalam satu pass cv2.LUT
+
+import cv2
+import numpy as np
+
+from features.image_statistics import ImageStatistics
+
+
+class ToneCurves:
+    """
+    Curves and levels compiled to lookup tables
+
+    Curves are lists of (input, output) control points in 0-255 and are
+    interpolated with a monotone cubic (Fritsch-Carlson) spline, so they
+    never overshoot between points. Any combination of levels, per-channel
+    curves and a master curve compiles to one (256, 1, 3) table.
+
+    Order of application (like common editors): levels, then the channel
+    curve, then the master curve.
+
+    Usage:
+        lut = ToneCurves.compile(master=[(0, 0), (64, 50), (192, 210), (255, 255)],
+                                 levels=ToneCurves.levels_lut(10, 245, 1.1))
+        result = ToneCurves.apply(image, lut)
+    """
+
+    IDENTITY = np.arange(256, dtype=np.uint8)
+
+    @staticmethod
+    def _to_uint8(values):
+        return np.clip(np.rint(values), 0, 255).astype(np.uint8)
+
+    @staticmethod
+    def spline_lut(points):
+        """
+        256-entry LUT through control points with a monotone cubic spline
+
+        Args:
+            points: Iterable of (input, output) pairs in 0-255. Inputs
+                outside the first/last point keep the end values.
+        """
+        points = sorted((float(x), float(y)) for x, y in points)
+        xs = np.array([p[0] for p in points])
+        ys = np.array([p[1] for p in points])
+        if len(xs) == 0:
+            return ToneCurves.IDENTITY.copy()
+        if len(np.unique(xs)) != len(xs):
+            raise ValueError("Curve points must have distinct input values")
+        if len(xs) == 1:
+            return np.full(256, ToneCurves._to_uint8(ys[0]), dtype=np.uint8)
+
+        # Fritsch-Carlson tangents
+        h = np.diff(xs)
+        delta = np.diff(ys) / h
+        tangents = np.empty_like(xs)
+        tangents[0], tangents[-1] = delta[0], delta[-1]
+        # Flat tangent where the slope changes sign (local extremum)
+        tangents[1:-1] = np.where(delta[:-1] * delta[1:] > 0, (delta[:-1] + delta[1:]) / 2.0, 0.0)
+        for i, d in enumerate(delta):
+            if d == 0.0:
+                tangents[i] = tangents[i + 1] = 0.0
+                continue
+            # Limit tangents so the segment stays monotone
+            a, b = tangents[i] / d, tangents[i + 1] / d
+            norm = a * a + b * b
+            if norm > 9.0:
+                scale = 3.0 / np.sqrt(norm)
+                tangents[i], tangents[i + 1] = scale * a * d, scale * b * d
+
+        # Evaluate the Hermite segments at every level
+        x = np.clip(np.arange(256, dtype=np.float64), xs[0], xs[-1])
+        seg = np.clip(np.searchsorted(xs, x, side="right") - 1, 0, len(xs) - 2)
+        t = (x - xs[seg]) / h[seg]
+        t2, t3 = t * t, t * t * t
+        values = ((2 * t3 - 3 * t2 + 1) * ys[seg] + (t3 - 2 * t2 + t) * h[seg] * tangents[seg]
+                  + (-2 * t3 + 3 * t2) * ys[seg + 1] + (t3 - t2) * h[seg] * tangents[seg + 1])
+        return ToneCurves._to_uint8(values)
+
+    @staticmethod
+    def levels_lut(black=0, white=255, gamma=1.0, out_black=0, out_white=255):
+        """
+        Levels: map [black, white] to [out_black, out_white] with a midtone gamma
+
+        Args:
+            gamma: Midtone gamma; > 1 brightens midtones, < 1 darkens them
+        """
+        if white <= black:
+            raise ValueError("White point must be above the black point")
+        x = np.clip((np.arange(256, dtype=np.float64) - black) / (white - black), 0.0, 1.0)
+        x = x ** (1.0 / gamma)
+        return ToneCurves._to_uint8(out_black + x * (out_white - out_black))
+
+    @staticmethod
+    def compose(*luts):
+        """Single LUT equal to applying luts left to right (1D or (256, 1, C) tables)"""
+        result = None
+        for lut in luts:
+            lut = np.asarray(lut, dtype=np.uint8)
+            result = lut if result is None else ToneCurves._index(lut, result)
+        return result
+
+    @staticmethod
+    def _index(lut, indices):
+        """lut[indices], channel by channel when either table is per-channel"""
+        if lut.ndim == 1 and indices.ndim == 1:
+            return lut[indices]
+        lut = ToneCurves._per_channel(lut)
+        indices = ToneCurves._per_channel(indices)
+        return np.stack([lut[indices[:, 0, c], 0, c] for c in range(3)], axis=1).reshape(256, 1, 3)
+
+    @staticmethod
+    def _per_channel(lut):
+        """Broadcast a 1D table to (256, 1, 3)"""
+        lut = np.asarray(lut, dtype=np.uint8)
+        if lut.ndim == 1:
+            return np.repeat(lut.reshape(256, 1, 1), 3, axis=2)
+        return lut.reshape(256, 1, 3)
+
+    @staticmethod
+    def compile(channels=None, master=None, levels=None):
+        """
+        Compile levels and curves into one (256, 1, 3) table for BGR images
+
+        Args:
+            channels: Optional sequence of 3 point lists (B, G, R; None = identity)
+            master: Optional point list applied to all channels last
+            levels: Optional levels LUT (1D, or (256, 1, 3) from auto_levels)
+        """
+        steps = []
+        if levels is not None:
+            steps.append(levels)
+        if channels is not None:
+            tables = [ToneCurves.IDENTITY if points is None else ToneCurves.spline_lut(points)
+                      for points in channels]
+            steps.append(np.stack(tables, axis=1).reshape(256, 1, 3))
+        if master is not None:
+            steps.append(ToneCurves.spline_lut(master))
+        if not steps:
+            return ToneCurves._per_channel(ToneCurves.IDENTITY)
+        return ToneCurves._per_channel(ToneCurves.compose(*steps))
+
+    @staticmethod
+    def apply(image, lut):
+        """Apply a compiled table in one cv2.LUT pass (grayscale images use the first channel)"""
+        lut = np.asarray(lut, dtype=np.uint8)
+        if len(image.shape) == 2 and lut.ndim == 3:
+            lut = np.ascontiguousarray(lut[:, 0, 0])
+        return cv2.LUT(image, lut)
+
+    @staticmethod
+    def auto_levels_lut(image, low=0.5, high=99.5, per_channel=False, accuracy="balanced"):
+        """
+        Levels stretching the low/high percentiles to black/white
+
+        Args:
+            low, high: Percentiles treated as black and white points
+            per_channel: Stretch each channel independently (also removes
+                color casts); otherwise one black/white point for all channels
+            accuracy: ImageStatistics accuracy for the percentiles
+
+        Returns:
+            (256, 1, 3) table
+        """
+        lows, highs = ImageStatistics.percentiles(image, (low, high), accuracy)
+        if not per_channel:
+            lows = np.full_like(lows, lows.min())
+            highs = np.full_like(highs, highs.max())
+        tables = []
+        for black, white in zip(lows, highs):
+            if white - black < 1:
+                tables.append(ToneCurves.IDENTITY)
+            else:
+                tables.append(ToneCurves.levels_lut(black, white))
+        if len(tables) == 1:
+            tables = tables * 3
+        return np.stack(tables, axis=1).reshape(256, 1, 3)
+
+    @staticmethod
+    def auto_levels(image, low=0.5, high=99.5, per_channel=False, accuracy="balanced"):
+        """Auto-levels an image (statistics from a subsample, one LUT pass)"""
+        return ToneCurves.apply(image, ToneCurves.auto_levels_lut(image, low, high, per_channel, accuracy))
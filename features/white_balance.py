@@ -0,0 +1,125 @@
+# File: features/white_balance.py
+# Deskripsi: White balance engine - statistik dari grid subsample, koreksi
+#            lewat lookup table 256 entri dengan aritmetika uint8 saturating
+#            (tanpa array float64 ukuran penuh)
+
+import cv2
+import numpy as np
+
+from features.image_cache import ImageCache
+from features.image_statistics import ImageStatistics
+
+
+class WhiteBalance:
+    """
+    White balance in three flavours
+
+    - lab: LAB gray-world shift of a/b, weighted by lightness (the original
+      AIColorCorrection.white_balance formula)
+    - gray_world: per-channel BGR gains so all channel means match
+    - white_patch: per-channel gains mapping a high percentile to white
+
+    Statistics come from ImageStatistics' subsample (accuracy knob);
+    corrections are applied with cv2.LUT and saturating cv2.add/cv2.subtract
+    on uint8 planes.
+    """
+
+    METHODS = ("lab", "gray_world", "white_patch")
+
+    # ---- LAB gray-world ----
+
+    @staticmethod
+    def lab_offset_table(mean, strength=1.1):
+        """
+        Per-L correction for one chroma plane: offset[L] = (mean - 128) * L / 255 * strength
+
+        Returns:
+            (table, sign) - uint8 magnitude table (256 entries) and the sign
+            of the offset (it is the same for every L)
+        """
+        offsets = np.abs(mean - 128.0) * strength * (np.arange(256, dtype=np.float32) / 255.0)
+        table = np.clip(np.rint(offsets), 0, 255).astype(np.uint8)
+        return table, (1 if mean >= 128.0 else -1)
+
+    @staticmethod
+    def correct_lab_planes(l, a, b, strength=1.1, means=None, accuracy="balanced"):
+        """
+        Shift a and b towards neutral, more strongly in bright pixels
+
+        Args:
+            l, a, b: uint8 LAB planes
+            strength: Correction strength (1.1 = original behaviour)
+            means: Optional precomputed (mean_a, mean_b)
+            accuracy: ImageStatistics accuracy when means must be measured
+
+        Returns:
+            (a, b) corrected planes (new arrays, saturated to 0-255)
+        """
+        if means is None:
+            means = (float(ImageStatistics.channel_means(a, accuracy)[0]),
+                     float(ImageStatistics.channel_means(b, accuracy)[0]))
+
+        corrected = []
+        for plane, mean in zip((a, b), means):
+            table, sign = WhiteBalance.lab_offset_table(mean, strength)
+            offset = cv2.LUT(l, table)
+            # Saturating uint8 arithmetic: no wrap-around at 0 / 255
+            corrected.append(cv2.subtract(plane, offset) if sign > 0 else cv2.add(plane, offset))
+        return corrected[0], corrected[1]
+
+    @staticmethod
+    def lab(image, strength=1.1, accuracy="balanced"):
+        """LAB gray-world white balance of a BGR image"""
+        cache = ImageCache.for_image(image)
+        l, a, b = cache.plane("lab", 0), cache.plane("lab", 1), cache.plane("lab", 2)
+        means = ImageStatistics.channel_means(cache.lab, accuracy)[1:]
+        a, b = WhiteBalance.correct_lab_planes(l, a, b, strength, means)
+        return cv2.cvtColor(cv2.merge((l, a, b)), cv2.COLOR_LAB2BGR)
+
+    # ---- Channel gains ----
+
+    @staticmethod
+    def gain_lut(gains):
+        """(256, 1, 3) uint8 table applying per-channel gains with saturation"""
+        levels = np.arange(256, dtype=np.float32)[:, None] * np.asarray(gains, dtype=np.float32)[None, :]
+        return np.clip(np.rint(levels), 0, 255).astype(np.uint8).reshape(256, 1, 3)
+
+    @staticmethod
+    def apply_gains(image, gains):
+        """Multiply each BGR channel by its gain in one cv2.LUT pass"""
+        return cv2.LUT(image, WhiteBalance.gain_lut(gains))
+
+    @staticmethod
+    def gray_world_gains(image, accuracy="balanced"):
+        """Gains equalizing the B, G, R means (gray-world assumption)"""
+        means = np.maximum(ImageStatistics.channel_means(image, accuracy), 1e-3)
+        return means.mean() / means
+
+    @staticmethod
+    def white_patch_gains(image, percentile=99.0, accuracy="balanced"):
+        """Gains mapping each channel's percentile to 255 (white-patch / max-RGB)"""
+        highs = ImageStatistics.percentiles(image, percentile, accuracy)
+        return 255.0 / np.maximum(highs, 1.0)
+
+    @staticmethod
+    def gray_world(image, accuracy="balanced"):
+        """Gray-world white balance of a BGR image"""
+        return WhiteBalance.apply_gains(image, WhiteBalance.gray_world_gains(image, accuracy))
+
+    @staticmethod
+    def white_patch(image, percentile=99.0, accuracy="balanced"):
+        """White-patch white balance; percentile < 100 ignores specular highlights"""
+        return WhiteBalance.apply_gains(image, WhiteBalance.white_patch_gains(image, percentile, accuracy))
+
+    @staticmethod
+    def balance(image, method="lab", **kwargs):
+        """
+        Dispatch to a white balance method
+        Args:
+            image: BGR uint8 image
+            method: 'lab', 'gray_world' or 'white_patch'
+            kwargs: strength (lab), percentile (white_patch), accuracy (all)
+        """
+        if method not in WhiteBalance.METHODS:
+            raise ValueError(f"Method must be one of {', '.join(WhiteBalance.METHODS)}")
+        return getattr(WhiteBalance, method)(image, **kwargs)
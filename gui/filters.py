@@ -1,5 +1,19 @@
 import cv2
 import numpy as np
+import sys
+import os
+import time
+from functools import lru_cache
+
+# Add parent directory to path untuk import features
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from features.binary_mask import PackedMask
+from features.convolution import ConvolutionDispatcher
+from features.image_cache import ImageCache
+from features.image_statistics import ImageStatistics
+from features.operations import OperationRegistry
+from features.resampling import ResizeEngine
 
 
 class LinearFilters:
@@ -7,27 +21,43 @@ class LinearFilters:
     
     @staticmethod
     def mean_filter(image, kernel_size=3):
-        """Apply Mean Filter (Box Filter)"""
-        if kernel_size < 1 or kernel_size % 2 == 0:
-            raise ValueError("Kernel size must be odd and positive")
-        return cv2.blur(image, (kernel_size, kernel_size))
+        """Apply Mean Filter (Box Filter); even kernel sizes raise ValueError"""
+        return OperationRegistry.apply("average_blur", image, strict=True, kernel_size=kernel_size)
     
     @staticmethod
     def gaussian_filter(image, kernel_size=3, sigma=1.0):
-        """Apply Gaussian Filter"""
-        if kernel_size < 1 or kernel_size % 2 == 0:
-            raise ValueError("Kernel size must be odd and positive")
-        return cv2.GaussianBlur(image, (kernel_size, kernel_size), sigmaX=sigma, sigmaY=sigma)
-    
-    @staticmethod
-    def sharpen_filter(image):
-        """Apply Sharpening Filter"""
-        sharpen_kernel = np.array([
-            [0, -1, 0],
-            [-1, 5, -1],
-            [0, -1, 0]
-        ], dtype=np.float32)
-        return cv2.filter2D(image, -1, sharpen_kernel)
+        """Apply Gaussian Filter (switches to FFT for very large kernels)"""
+        return OperationRegistry.apply("gaussian_blur", image, strict=True, kernel_size=kernel_size, sigma=sigma)
+    
+    @staticmethod
+    def custom_filter(image, kernel, method="auto"):
+        """
+        Apply an arbitrary 2D kernel
+        Args:
+            image: Input image
+            kernel: 2D kernel (correlation, like cv2.filter2D)
+            method: "auto", "spatial", "separable" or "fft"
+        """
+        return ConvolutionDispatcher.convolve(image, kernel, method)
+    
+    @staticmethod
+    def sharpen_filter(image, strength=1.0):
+        """Apply Sharpening Filter (3x3 Laplacian; strength 1.0 = classic kernel)"""
+        return OperationRegistry.apply("sharpen", image, strength=strength)
+    
+    @staticmethod
+    def unsharp_mask(image, radius=1.0, amount=1.0, threshold=0, blur="gaussian", luminance_only=False):
+        """
+        Apply Unsharp Mask
+        Args:
+            radius: Blur sigma in pixels
+            amount: Strength (1.0 = 100%)
+            threshold: Minimum local contrast (0-255) to sharpen
+            blur: "gaussian" (separable) or "box" (stacked box blurs)
+            luminance_only: Sharpen only the luminance plane
+        """
+        return OperationRegistry.apply("unsharp_mask", image, radius=radius, amount=amount,
+                                       threshold=threshold, blur=blur, luminance_only=luminance_only)
 
 
 class NonLinearFilters:
@@ -35,75 +65,252 @@ class NonLinearFilters:
     
     @staticmethod
     def median_filter(image, kernel_size=3):
-        """Apply Median Filter"""
-        if kernel_size < 1 or kernel_size % 2 == 0:
-            raise ValueError("Kernel size must be odd and positive")
-        return cv2.medianBlur(image, kernel_size)
+        """Apply Median Filter; even kernel sizes raise ValueError"""
+        return OperationRegistry.apply("median_blur", image, strict=True, kernel_size=kernel_size)
 
 
 class EdgeDetection:
-    """Class for edge detection operations"""
+    """
+    Class for edge detection operations
+    
+    Every detector accepts a BGR/grayscale array or an ImageCache. Grayscale,
+    derivatives and Gaussian-blurred planes are memoized per image through
+    ImageCache, so showing several edge maps of one image computes each of
+    them only once.
+    """
+    
+    # Prewitt = [-1, 0, 1] derivative x [1, 1, 1] smoothing (separable)
+    PREWITT_DERIVATIVE = np.array([-1, 0, 1], dtype=np.float32)
+    PREWITT_SMOOTH = np.array([1, 1, 1], dtype=np.float32)
+    
+    @staticmethod
+    def to_gray(image):
+        """Return the (cached) single-channel uint8 version of image"""
+        return ImageCache.for_image(image).gray
+    
+    @staticmethod
+    def compute_gradients(gray, operator="sobel"):
+        """
+        Compute X and Y derivatives as int16 images
+        
+        Args:
+            gray: Single-channel uint8 image
+            operator: "sobel" (one cv2.spatialGradient pass), "scharr" or "prewitt"
+        
+        Returns:
+            (grad_x, grad_y) as CV_16S arrays
+        """
+        if operator == "sobel":
+            return cv2.spatialGradient(gray, ksize=3)
+        elif operator == "scharr":
+            grad_x = cv2.Scharr(gray, cv2.CV_16S, 1, 0)
+            grad_y = cv2.Scharr(gray, cv2.CV_16S, 0, 1)
+            return grad_x, grad_y
+        elif operator == "prewitt":
+            d, k = EdgeDetection.PREWITT_DERIVATIVE, EdgeDetection.PREWITT_SMOOTH
+            grad_x = cv2.sepFilter2D(gray, cv2.CV_16S, d, k)
+            grad_y = cv2.sepFilter2D(gray, cv2.CV_16S, k, d)
+            return grad_x, grad_y
+        else:
+            raise ValueError("Operator must be 'sobel', 'scharr', or 'prewitt'")
     
     @staticmethod
-    def sobel_edge(image):
+    def cached_gradients(image, operator="sobel"):
+        """Derivatives of image, computed once per image and operator"""
+        cache = ImageCache.for_image(image)
+        return cache.get(("gradients", operator),
+                         lambda: EdgeDetection.compute_gradients(cache.gray, operator))
+    
+    @staticmethod
+    def cached_gaussian(image, sigma):
+        """Gaussian-blurred float32 grayscale, computed once per image and sigma"""
+        cache = ImageCache.for_image(image)
+        return cache.get(("gaussian", float(sigma)),
+                         lambda: cv2.GaussianBlur(cache.gray.astype(np.float32), (0, 0), sigma))
+    
+    @staticmethod
+    def gradient_magnitude(grad_x, grad_y, norm="l2"):
+        """
+        Combine derivatives into an 8-bit edge magnitude
+        
+        Args:
+            grad_x, grad_y: Derivatives (int16 or float32)
+            norm: "l2" - sqrt(gx^2 + gy^2) via cv2.magnitude in float32
+                  "l1" - |gx| + |gy|, integer-only fast path
+        
+        Returns:
+            uint8 magnitude, saturated at 255
+        """
+        if norm == "l2":
+            magnitude = cv2.magnitude(grad_x.astype(np.float32, copy=False),
+                                      grad_y.astype(np.float32, copy=False))
+            return cv2.convertScaleAbs(magnitude)
+        elif norm == "l1":
+            return cv2.add(cv2.convertScaleAbs(grad_x), cv2.convertScaleAbs(grad_y))
+        else:
+            raise ValueError("Norm must be 'l2' or 'l1'")
+    
+    @staticmethod
+    def _finish(edges, single_channel):
+        """Return single-channel edges or the 3-channel BGR the GUI displays"""
+        if single_channel:
+            return edges
+        return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
+    
+    @staticmethod
+    def sobel_edge(image, norm="l2", single_channel=False):
         """Apply Sobel Edge Detection"""
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        sobel_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-        sobel_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-        sobel_magnitude = np.sqrt(sobel_x**2 + sobel_y**2)
-        sobel_magnitude = np.uint8(np.clip(sobel_magnitude, 0, 255))
-        return cv2.cvtColor(sobel_magnitude, cv2.COLOR_GRAY2BGR)
+        sobel_x, sobel_y = EdgeDetection.cached_gradients(image, "sobel")
+        sobel_magnitude = EdgeDetection.gradient_magnitude(sobel_x, sobel_y, norm)
+        return EdgeDetection._finish(sobel_magnitude, single_channel)
     
     @staticmethod
-    def prewitt_edge(image):
+    def prewitt_edge(image, norm="l2", single_channel=False):
         """Apply Prewitt Edge Detection"""
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        kernel_x = np.array([[-1, 0, 1], [-1, 0, 1], [-1, 0, 1]], dtype=np.float32)
-        kernel_y = np.array([[-1, -1, -1], [0, 0, 0], [1, 1, 1]], dtype=np.float32)
-        prewitt_x = cv2.filter2D(gray, cv2.CV_64F, kernel_x)
-        prewitt_y = cv2.filter2D(gray, cv2.CV_64F, kernel_y)
-        prewitt_magnitude = np.sqrt(prewitt_x**2 + prewitt_y**2)
-        prewitt_magnitude = np.uint8(np.clip(prewitt_magnitude, 0, 255))
-        return cv2.cvtColor(prewitt_magnitude, cv2.COLOR_GRAY2BGR)
+        prewitt_x, prewitt_y = EdgeDetection.cached_gradients(image, "prewitt")
+        prewitt_magnitude = EdgeDetection.gradient_magnitude(prewitt_x, prewitt_y, norm)
+        return EdgeDetection._finish(prewitt_magnitude, single_channel)
     
     @staticmethod
-    def laplacian_edge(image):
+    def scharr_edge(image, norm="l2", single_channel=False):
+        """
+        Apply Scharr Edge Detection
+        More rotation-invariant than Sobel at the same 3x3 cost
+        """
+        scharr_x, scharr_y = EdgeDetection.cached_gradients(image, "scharr")
+        scharr_magnitude = EdgeDetection.gradient_magnitude(scharr_x, scharr_y, norm)
+        return EdgeDetection._finish(scharr_magnitude, single_channel)
+    
+    @staticmethod
+    def laplacian_edge(image, single_channel=False):
         """Apply Laplacian Edge Detection"""
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        laplacian = cv2.Laplacian(gray, cv2.CV_64F, ksize=3)
-        laplacian = np.uint8(np.clip(np.abs(laplacian), 0, 255))
-        return cv2.cvtColor(laplacian, cv2.COLOR_GRAY2BGR)
+        gray = EdgeDetection.to_gray(image)
+        laplacian = cv2.Laplacian(gray, cv2.CV_16S, ksize=3)
+        laplacian = cv2.convertScaleAbs(laplacian)
+        return EdgeDetection._finish(laplacian, single_channel)
+    
+    @staticmethod
+    def auto_canny_thresholds(image, sigma=0.33):
+        """
+        Canny thresholds from the median intensity
+        
+        Args:
+            image: Input image or ImageCache
+            sigma: Spread around the median (0.33 is a good default)
+        
+        Returns:
+            (low, high) thresholds
+        """
+        cache = ImageCache.for_image(image)
+        median = cache.get("median", lambda: float(ImageStatistics.percentiles(cache.gray, 50)[0]))
+        low = int(max(0, (1.0 - sigma) * median))
+        high = int(min(255, (1.0 + sigma) * median))
+        return low, high
+    
+    @staticmethod
+    def canny_edge(image, low=None, high=None, sigma=0.33, l2_gradient=True,
+                   single_channel=False):
+        """
+        Apply Canny Edge Detection
+        
+        Args:
+            image: Input image or ImageCache
+            low, high: Hysteresis thresholds (auto from the median if None)
+            sigma: Spread used for automatic thresholds
+            l2_gradient: Use the exact L2 gradient norm
+        
+        Reuses the cached Sobel derivatives instead of recomputing them.
+        """
+        if low is None or high is None:
+            auto_low, auto_high = EdgeDetection.auto_canny_thresholds(image, sigma)
+            low = auto_low if low is None else low
+            high = auto_high if high is None else high
+        
+        sobel_x, sobel_y = EdgeDetection.cached_gradients(image, "sobel")
+        edges = cv2.Canny(sobel_x, sobel_y, low, high, L2gradient=l2_gradient)
+        return EdgeDetection._finish(edges, single_channel)
+    
+    @staticmethod
+    def dog_edge(image, sigma=1.0, k=1.6, single_channel=False):
+        """
+        Difference-of-Gaussians edge / blob response
+        
+        Args:
+            image: Input image or ImageCache
+            sigma: Inner Gaussian sigma
+            k: Ratio between the outer and inner sigma
+        
+        Returns:
+            |G(sigma) - G(k*sigma)| stretched to 0-255
+        """
+        inner = EdgeDetection.cached_gaussian(image, sigma)
+        outer = EdgeDetection.cached_gaussian(image, sigma * k)
+        dog = cv2.absdiff(inner, outer)
+        dog = cv2.normalize(dog, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+        return EdgeDetection._finish(dog, single_channel)
+    
+    @staticmethod
+    def multiscale_edge(image, sigmas=(1.0, 2.0, 4.0), single_channel=False):
+        """
+        Multi-scale edges: per-pixel maximum of DoG responses across scales
+        
+        Consecutive sigmas share their blurred planes, so N scales cost N + 1
+        Gaussian blurs (and fewer if other detectors already blurred this image).
+        
+        Args:
+            image: Input image or ImageCache
+            sigmas: Increasing sigmas; each DoG uses (sigma_i, sigma_i+1)
+        """
+        sigmas = sorted(sigmas)
+        if len(sigmas) < 2:
+            sigmas = [sigmas[0], sigmas[0] * 1.6] if sigmas else [1.0, 1.6]
+        
+        response = None
+        for inner_sigma, outer_sigma in zip(sigmas[:-1], sigmas[1:]):
+            dog = cv2.absdiff(EdgeDetection.cached_gaussian(image, inner_sigma),
+                              EdgeDetection.cached_gaussian(image, outer_sigma))
+            # Normalize per scale so coarse scales are not drowned out
+            dog = cv2.normalize(dog, None, 0, 1, cv2.NORM_MINMAX)
+            response = dog if response is None else cv2.max(response, dog)
+        
+        edges = cv2.convertScaleAbs(response, alpha=255)
+        return EdgeDetection._finish(edges, single_channel)
 
 
 class GeometricTransforms:
     """Class for geometric transformations"""
     
     @staticmethod
-    def crop_image(image, x, y, width, height):
+    def crop_image(image, x, y, width, height, contiguous=False):
         """
         Crop image to specified region
         Args:
             image: Input image
             x, y: Top-left corner coordinates
             width, height: Crop dimensions
+            contiguous: If False (default) returns a zero-copy view of image
         """
         h, w = image.shape[:2]
         x = max(0, min(x, w))
         y = max(0, min(y, h))
         x2 = max(0, min(x + width, w))
         y2 = max(0, min(y + height, h))
-        return image[y:y2, x:x2]
+        cropped = image[y:y2, x:x2]
+        return GeometricTransforms.materialize(cropped) if contiguous else cropped
     
     @staticmethod
-    def resize_image(image, width=None, height=None, scale=None, interpolation=cv2.INTER_LINEAR):
+    def resize_image(image, width=None, height=None, scale=None, interpolation=None):
         """
-        Resize image
+        Resize image (large reductions go through repeated 2x INTER_AREA halvings)
         Args:
             image: Input image
             width: Target width (if None, calculated from height or scale)
             height: Target height (if None, calculated from width or scale)
             scale: Scale factor (used if width and height are None)
-            interpolation: Interpolation method (INTER_LINEAR, INTER_CUBIC, INTER_NEAREST)
+            interpolation: Interpolation method (INTER_LINEAR, INTER_CUBIC, INTER_NEAREST);
+                None picks INTER_AREA for reductions and INTER_LANCZOS4 for enlargements.
+                Only None, INTER_AREA and INTER_LINEAR use the halvings; other
+                methods (e.g. INTER_NEAREST for masks) are one direct cv2.resize
         """
         h, w = image.shape[:2]
         
@@ -117,7 +324,7 @@ class GeometricTransforms:
         elif width is None and height is None:
             raise ValueError("Must specify width, height, or scale")
         
-        return cv2.resize(image, (width, height), interpolation=interpolation)
+        return ResizeEngine.resize(image, (width, height), interpolation)
     
     @staticmethod
     def rotate_image(image, angle, scale=1.0, keep_size=True):
@@ -151,24 +358,256 @@ class GeometricTransforms:
             return cv2.warpAffine(image, M, (w, h))
     
     @staticmethod
-    def flip_image(image, flip_code):
+    def flip_image(image, flip_code, contiguous=True):
         """
         Flip image
         Args:
             image: Input image
             flip_code: 0 = vertical flip, 1 = horizontal flip, -1 = both
+            contiguous: If False returns a zero-copy (negatively strided) view
         """
-        return cv2.flip(image, flip_code)
+        if contiguous:
+            return cv2.flip(image, flip_code)
+        rows = slice(None, None, -1) if flip_code <= 0 else slice(None)
+        cols = slice(None, None, -1) if flip_code != 0 else slice(None)
+        return image[rows, cols]
     
     @staticmethod
-    def rotate_90(image, k=1):
+    def rotate_90(image, k=1, contiguous=True):
         """
         Rotate image by 90 degrees
         Args:
             image: Input image
             k: Number of 90-degree rotations (1=90°, 2=180°, 3=270°)
+            contiguous: If False returns the zero-copy np.rot90 view
         """
-        return np.rot90(image, k)
+        rotated = np.rot90(image, k)
+        return GeometricTransforms.materialize(rotated) if contiguous else rotated
+    
+    @staticmethod
+    def materialize(image):
+        """
+        Contiguous buffer for a (possibly strided) view, copying only if needed
+        
+        Views from crop_image / flip_image / rotate_90 with contiguous=False
+        are O(1); call this before handing them to code that needs a
+        C-contiguous array (in-place OpenCV calls, raw buffer access).
+        """
+        return np.ascontiguousarray(image)
+
+class TransformStack:
+    """
+    Deferred chain of geometric edits, resampled once
+    
+    Every rotate/flip/resize/crop only composes a 3x3 affine matrix (mapping
+    source pixel coordinates to output coordinates) and updates the output
+    size. render() applies the whole chain with a single cv2.warpAffine, so
+    N chained edits cost one interpolation pass instead of N, and repeated
+    rotations do not accumulate blur. crop() is the exception: it re-bases
+    the stack on the cropped region (rendering first if the chain so far
+    resamples), so later steps never sample pixels outside the crop.
+    
+    Pixel-center conventions match the immediate operations: resize matches
+    cv2.resize, flip matches cv2.flip and rotate_90 matches np.rot90.
+    
+    interpolation=None picks the kernel from the overall scale. Strong
+    reductions are pre-shrunk by repeated 2x INTER_AREA halvings (see
+    ResizeEngine) so the single warp does not alias; explicit kernels other
+    than INTER_AREA / INTER_LINEAR (e.g. INTER_NEAREST) warp the source as is.
+    
+    Usage:
+        stack = TransformStack(image)
+        stack.rotate(15).crop(40, 40, 800, 600).resize(400, 300)
+        result = stack.render()
+    """
+    
+    def __init__(self, image, interpolation=None):
+        self.source = image
+        self.interpolation = interpolation
+        h, w = image.shape[:2]
+        self.size = (w, h)
+        self.matrix = np.eye(3)
+    
+    def _push(self, step, size):
+        """Append a step (3x3 matrix in current output coordinates)"""
+        self.matrix = step @ self.matrix
+        self.size = (int(size[0]), int(size[1]))
+        return self
+    
+    def rotate(self, angle, scale=1.0, expand=True):
+        """
+        Rotate around the current center
+        Args:
+            angle: Rotation angle in degrees (positive = counter-clockwise)
+            scale: Scale factor
+            expand: Grow the output to fit the whole rotated image
+        """
+        w, h = self.size
+        center = (w // 2, h // 2)
+        step = np.vstack([cv2.getRotationMatrix2D(center, angle, scale), [0, 0, 1]])
+        
+        if not expand:
+            return self._push(step, (w, h))
+        
+        cos = abs(step[0, 0])
+        sin = abs(step[0, 1])
+        new_w = int((h * sin) + (w * cos))
+        new_h = int((h * cos) + (w * sin))
+        step[0, 2] += (new_w / 2) - center[0]
+        step[1, 2] += (new_h / 2) - center[1]
+        return self._push(step, (new_w, new_h))
+    
+    def rotate_90(self, k=1):
+        """Rotate by k * 90 degrees counter-clockwise (like np.rot90)"""
+        for _ in range(k % 4):
+            w, h = self.size
+            # Output pixel (x', y') = (y, w - 1 - x)
+            step = np.array([[0.0, 1.0, 0.0], [-1.0, 0.0, w - 1.0], [0.0, 0.0, 1.0]])
+            self._push(step, (h, w))
+        return self
+    
+    def flip(self, flip_code):
+        """Flip: 0 = vertical, 1 = horizontal, -1 = both (like cv2.flip)"""
+        w, h = self.size
+        step = np.eye(3)
+        if flip_code != 0:
+            step[0, 0], step[0, 2] = -1.0, w - 1.0
+        if flip_code <= 0:
+            step[1, 1], step[1, 2] = -1.0, h - 1.0
+        return self._push(step, (w, h))
+    
+    def resize(self, width, height):
+        """Scale the current output to width x height"""
+        w, h = self.size
+        sx, sy = width / w, height / h
+        # Half-pixel centers, like cv2.resize: x' = sx * (x + 0.5) - 0.5
+        step = np.array([[sx, 0.0, 0.5 * (sx - 1.0)],
+                         [0.0, sy, 0.5 * (sy - 1.0)],
+                         [0.0, 0.0, 1.0]])
+        return self._push(step, (width, height))
+    
+    def crop(self, x, y, width, height):
+        """
+        Keep the region at (x, y) of size width x height (clamped to the output)
+        
+        Later steps must not see cropped-away pixels, so the crop re-bases the
+        stack on the cropped region: after lossless steps that is a zero-copy
+        view of the source, after resampling steps the chain so far is
+        rendered first.
+        
+        Raises:
+            ValueError: The clamped region is empty
+        """
+        w, h = self.size
+        x = max(0, min(x, w))
+        y = max(0, min(y, h))
+        x2 = max(0, min(x + width, w))
+        y2 = max(0, min(y + height, h))
+        if x2 <= x or y2 <= y:
+            raise ValueError("Crop region is empty")
+        if self._lossless_inverse() is None:
+            self.source = self.render()
+            self.matrix = np.eye(3)
+        step = np.array([[1.0, 0.0, -x], [0.0, 1.0, -y], [0.0, 0.0, 1.0]])
+        self._push(step, (x2 - x, y2 - y))
+        cropped = self.view()
+        if cropped is not None:
+            self.source = cropped
+            self.matrix = np.eye(3)
+        return self
+    
+    def is_identity(self):
+        """True if the chain leaves the (possibly re-based) source unchanged"""
+        return self.size == self.source.shape[1::-1] and np.allclose(self.matrix, np.eye(3))
+    
+    def _lossless_inverse(self):
+        """
+        Integer output-to-source matrix if the chain only flips, rotates by
+        multiples of 90 degrees and crops (no resampling needed), else None
+        """
+        inverse = np.linalg.inv(self.matrix)
+        rounded = np.round(inverse)
+        if not np.allclose(inverse, rounded, atol=1e-6):
+            return None
+        linear = np.abs(rounded[:2, :2])
+        if not (np.array_equal(linear, np.eye(2)) or np.array_equal(linear, np.eye(2)[::-1])):
+            return None
+        return rounded.astype(int)
+    
+    @staticmethod
+    def _axis_slice(start, step, count, length):
+        """Slice taking count indices start, start + step, ... (None if out of range)"""
+        end = start + step * (count - 1)
+        if count <= 0 or not (0 <= start < length and 0 <= end < length):
+            return None
+        if step == 1:
+            return slice(start, start + count)
+        return slice(start, start - count if start - count >= 0 else None, -1)
+    
+    def view(self):
+        """
+        Zero-copy strided view of the result for lossless chains
+        
+        Flips, 90-degree rotations and crops only reorder or select pixels,
+        so they are expressed as a transposed / negatively strided slice of
+        the source. Returns None when the chain needs resampling.
+        """
+        inverse = self._lossless_inverse()
+        if inverse is None:
+            return None
+        (a, b, c), (d, e, f) = inverse[0], inverse[1]
+        w, h = self.size
+        src_h, src_w = self.source.shape[:2]
+        
+        if a != 0:
+            # Output (x', y') <- source (a * x' + c, e * y' + f)
+            rows = self._axis_slice(f, e, h, src_h)
+            cols = self._axis_slice(c, a, w, src_w)
+            base = self.source
+        else:
+            # Axes swapped: output (x', y') <- source (b * y' + c, d * x' + f)
+            rows = self._axis_slice(c, b, h, src_w)
+            cols = self._axis_slice(f, d, w, src_h)
+            base = self.source.swapaxes(0, 1)
+        if rows is None or cols is None:
+            return None
+        return base[rows, cols]
+    
+    def render(self, interpolation=None):
+        """
+        Resample the source once through the composed matrix
+        
+        Lossless chains skip interpolation and just copy the strided view.
+        Returns:
+            New contiguous image of size self.size
+        """
+        view = self.view()
+        if view is not None:
+            return np.array(view, order="C", copy=True)
+        if interpolation is None:
+            interpolation = self.interpolation
+        
+        # Crops leave strided views as the source
+        source = GeometricTransforms.materialize(self.source)
+        
+        # A plain resize of the whole source goes through the resize engine
+        # (INTER_AREA halvings + final step) instead of a warp
+        if np.allclose(self.matrix, TransformStack(source).resize(*self.size).matrix):
+            return ResizeEngine.resize(source, self.size, interpolation)
+        
+        source, matrix = ResizeEngine.prefilter_for_warp(source, self.matrix, interpolation)
+        if interpolation is None:
+            scale = float(np.linalg.svd(matrix[:2, :2], compute_uv=False)[-1])
+            interpolation = ResizeEngine.choose_interpolation(scale, warp=True)
+        
+        # Axis-aligned chains replicate edges like cv2.resize; arbitrary
+        # rotations keep the black corners of rotate_image
+        linear = matrix[:2, :2]
+        axis_aligned = (linear[0, 1] == 0 and linear[1, 0] == 0) or (linear[0, 0] == 0 and linear[1, 1] == 0)
+        border = cv2.BORDER_REPLICATE if axis_aligned else cv2.BORDER_CONSTANT
+        return cv2.warpAffine(source, matrix[:2], self.size,
+                              flags=interpolation, borderMode=border)
+
 
 class MorphologicalFilters:
     """Class for morphological operations on images"""
@@ -185,14 +624,60 @@ class MorphologicalFilters:
         Returns:
             Kernel/structuring element
         """
+        return MorphologicalFilters._cached_kernel(tuple(kernel_size), kernel_type)
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _cached_kernel(kernel_size, kernel_type):
+        """Build each structuring element once; cached copies are read-only"""
         if kernel_type == "rect":
-            return cv2.getStructuringElement(cv2.MORPH_RECT, kernel_size)
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, kernel_size)
         elif kernel_type == "ellipse":
-            return cv2.getStructuringElement(cv2.MORPH_ELLIPSE, kernel_size)
+            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, kernel_size)
         elif kernel_type == "cross":
-            return cv2.getStructuringElement(cv2.MORPH_CROSS, kernel_size)
+            kernel = cv2.getStructuringElement(cv2.MORPH_CROSS, kernel_size)
         else:
             raise ValueError("Kernel type must be 'rect', 'ellipse', or 'cross'")
+        kernel.setflags(write=False)
+        return kernel
+    
+    @staticmethod
+    def _erode(image, kernel_size, kernel_type, iterations=1):
+        """Erode with OpenCV or, for large kernels, the decomposed backend"""
+        if FastMorphology.is_beneficial(kernel_size, kernel_type, iterations):
+            return FastMorphology.erode(image, kernel_size, kernel_type, iterations)
+        kernel = MorphologicalFilters.create_kernel(kernel_size, kernel_type)
+        return cv2.erode(image, kernel, iterations=iterations)
+    
+    @staticmethod
+    def _dilate(image, kernel_size, kernel_type, iterations=1):
+        """Dilate with OpenCV or, for large kernels, the decomposed backend"""
+        if FastMorphology.is_beneficial(kernel_size, kernel_type, iterations):
+            return FastMorphology.dilate(image, kernel_size, kernel_type, iterations)
+        kernel = MorphologicalFilters.create_kernel(kernel_size, kernel_type)
+        return cv2.dilate(image, kernel, iterations=iterations)
+    
+    @staticmethod
+    def _morphology_ex(image, op, kernel_size, kernel_type):
+        """cv2.morphologyEx, composed from _erode/_dilate when the kernel is large"""
+        if not FastMorphology.is_beneficial(kernel_size, kernel_type):
+            kernel = MorphologicalFilters.create_kernel(kernel_size, kernel_type)
+            return cv2.morphologyEx(image, op, kernel)
+        
+        erode = lambda img: MorphologicalFilters._erode(img, kernel_size, kernel_type)
+        dilate = lambda img: MorphologicalFilters._dilate(img, kernel_size, kernel_type)
+        if op == cv2.MORPH_OPEN:
+            return dilate(erode(image))
+        elif op == cv2.MORPH_CLOSE:
+            return erode(dilate(image))
+        elif op == cv2.MORPH_GRADIENT:
+            return cv2.subtract(dilate(image), erode(image))
+        elif op == cv2.MORPH_TOPHAT:
+            return cv2.subtract(image, dilate(erode(image)))
+        elif op == cv2.MORPH_BLACKHAT:
+            return cv2.subtract(erode(dilate(image)), image)
+        else:
+            raise ValueError("Unsupported morphology operation")
     
     @staticmethod
     def erosion(image, kernel_size=(5, 5), kernel_type="rect", iterations=1):
@@ -200,8 +685,7 @@ class MorphologicalFilters:
         Erosion: Shrinks foreground objects, removes small noise
         Best for: Removing small white noise, separating objects
         """
-        kernel = MorphologicalFilters.create_kernel(kernel_size, kernel_type)
-        return cv2.erode(image, kernel, iterations=iterations)
+        return MorphologicalFilters._erode(image, kernel_size, kernel_type, iterations)
     
     @staticmethod
     def dilation(image, kernel_size=(5, 5), kernel_type="rect", iterations=1):
@@ -209,8 +693,7 @@ class MorphologicalFilters:
         Dilation: Expands foreground objects, fills small gaps
         Best for: Connecting broken lines, filling small holes
         """
-        kernel = MorphologicalFilters.create_kernel(kernel_size, kernel_type)
-        return cv2.dilate(image, kernel, iterations=iterations)
+        return MorphologicalFilters._dilate(image, kernel_size, kernel_type, iterations)
     
     @staticmethod
     def opening(image, kernel_size=(5, 5), kernel_type="rect"):
@@ -218,8 +701,7 @@ class MorphologicalFilters:
         Opening: Erosion followed by Dilation
         Best for: Removing background noise while preserving shape
         """
-        kernel = MorphologicalFilters.create_kernel(kernel_size, kernel_type)
-        return cv2.morphologyEx(image, cv2.MORPH_OPEN, kernel)
+        return MorphologicalFilters._morphology_ex(image, cv2.MORPH_OPEN, kernel_size, kernel_type)
     
     @staticmethod
     def closing(image, kernel_size=(5, 5), kernel_type="rect"):
@@ -227,8 +709,7 @@ class MorphologicalFilters:
         Closing: Dilation followed by Erosion
         Best for: Filling holes in foreground objects
         """
-        kernel = MorphologicalFilters.create_kernel(kernel_size, kernel_type)
-        return cv2.morphologyEx(image, cv2.MORPH_CLOSE, kernel)
+        return MorphologicalFilters._morphology_ex(image, cv2.MORPH_CLOSE, kernel_size, kernel_type)
     
     @staticmethod
     def morphological_gradient(image, kernel_size=(5, 5), kernel_type="rect"):
@@ -236,8 +717,7 @@ class MorphologicalFilters:
         Morphological Gradient: Dilation - Erosion
         Best for: Edge detection, extracting object boundaries
         """
-        kernel = MorphologicalFilters.create_kernel(kernel_size, kernel_type)
-        return cv2.morphologyEx(image, cv2.MORPH_GRADIENT, kernel)
+        return MorphologicalFilters._morphology_ex(image, cv2.MORPH_GRADIENT, kernel_size, kernel_type)
     
     @staticmethod
     def top_hat(image, kernel_size=(5, 5), kernel_type="rect"):
@@ -245,8 +725,7 @@ class MorphologicalFilters:
         Top Hat: Original - Opening
         Best for: Extracting small bright details from dark background
         """
-        kernel = MorphologicalFilters.create_kernel(kernel_size, kernel_type)
-        return cv2.morphologyEx(image, cv2.MORPH_TOPHAT, kernel)
+        return MorphologicalFilters._morphology_ex(image, cv2.MORPH_TOPHAT, kernel_size, kernel_type)
     
     @staticmethod
     def black_hat(image, kernel_size=(5, 5), kernel_type="rect"):
@@ -254,22 +733,252 @@ class MorphologicalFilters:
         Black Hat: Closing - Original
         Best for: Extracting small dark details from bright background
         """
-        kernel = MorphologicalFilters.create_kernel(kernel_size, kernel_type)
-        return cv2.morphologyEx(image, cv2.MORPH_BLACKHAT, kernel)
+        return MorphologicalFilters._morphology_ex(image, cv2.MORPH_BLACKHAT, kernel_size, kernel_type)
+    
+    @staticmethod
+    def morphology_bundle(image, kernel_size=(5, 5), kernel_type="rect"):
+        """
+        All seven basic morphological operations from shared erosion/dilation
+        
+        Erode and dilate run once; opening and closing reuse them (one more
+        pass each) and gradient / top hat / black hat are plain saturating
+        subtractions. Four neighbourhood passes instead of twelve, with
+        results identical to the individual methods.
+        
+        Returns:
+            Dict with "Erosion", "Dilation", "Opening", "Closing",
+            "Gradient", "Top Hat" and "Black Hat"
+        """
+        erode = lambda img: MorphologicalFilters._erode(img, kernel_size, kernel_type)
+        dilate = lambda img: MorphologicalFilters._dilate(img, kernel_size, kernel_type)
+        
+        eroded = erode(image)
+        dilated = dilate(image)
+        opened = dilate(eroded)
+        closed = erode(dilated)
+        
+        return {
+            "Erosion": eroded,
+            "Dilation": dilated,
+            "Opening": opened,
+            "Closing": closed,
+            "Gradient": cv2.subtract(dilated, eroded),
+            "Top Hat": cv2.subtract(image, opened),
+            "Black Hat": cv2.subtract(closed, image),
+        }
     
     @staticmethod
-    def preprocess_for_morphology(image):
+    def preprocess_for_morphology(image, packed=False):
         """
         Convert image to binary for morphological operations
         Returns both grayscale and binary versions
+        
+        With packed=True the binary version is a PackedMask (8 pixels per
+        byte) whose erode/dilate/opening/closing work on the packed bits.
         """
-        # Convert to grayscale if color
-        if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = image.copy()
+        # Convert to grayscale if color (reuses a cached conversion; copy since
+        # the caller owns the returned array)
+        gray = ImageCache.for_image(image).gray.copy()
+        
+        if packed:
+            return gray, PackedMask.from_uint8(gray, 127)
         
         # Apply binary threshold
         _, binary = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
         
-        return gray, binary
\ No newline at end of file
+        return gray, binary
+
+
+class FastMorphology:
+    """
+    Large-kernel erosion/dilation backend
+    
+    Every structuring element is split into rectangles (one per distinct row
+    run): a rect stays one rectangle, a cross becomes two line segments and an
+    ellipse becomes about height/2 nested rectangles. Each rectangle is two 1D
+    running min/max passes, and the union is combined with cv2.min / cv2.max,
+    so results are identical to cv2.erode / cv2.dilate.
+    
+    1D passes use OpenCV's vectorized line kernels; very long lines switch to
+    the van Herk / Gil-Werman algorithm (3 comparisons per pixel whatever the
+    length). OpenCV's own ellipse/cross path scales with the kernel area, so
+    the decomposition wins for large elements (about 1.8x at 101 px on 12 MP).
+    """
+    
+    # Smallest ellipse / cross kernel (longest side) worth decomposing
+    ELLIPSE_MIN_SIZE = 41
+    CROSS_MIN_SIZE = 51
+    # Line length from which NumPy van Herk / Gil-Werman beats OpenCV's 1D pass
+    # (measured on 3 MP; OpenCV still wins at 1 k px) - re-measure with calibrate()
+    VHGW_MIN_LENGTH = 2048
+    
+    @staticmethod
+    def calibrate(image_size=(1500, 2000), lengths=(513, 769, 1025, 1537, 2049, 3073),
+                  repeats=3, update=True):
+        """
+        Micro-benchmark OpenCV line kernels against van Herk / Gil-Werman
+        
+        Args:
+            image_size: (height, width) of the synthetic benchmark image
+            lengths: Line lengths to time (both axes are summed)
+            repeats: Timing repetitions (best-of)
+            update: If True, store the measured crossover in VHGW_MIN_LENGTH
+        
+        Returns:
+            Dict {length: {"opencv": s, "vhgw": s}}
+        """
+        rng = np.random.default_rng(0)
+        image = rng.integers(0, 256, size=image_size, dtype=np.uint8)
+        
+        def best_time(func):
+            best = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                func()
+                best = min(best, time.perf_counter() - start)
+            return best
+        
+        timings = {}
+        for length in lengths:
+            lo, hi = -(length // 2), length - 1 - length // 2
+            timings[length] = {
+                "opencv": sum(best_time(lambda line=line: cv2.erode(image, line))
+                              for line in (np.ones((1, length), np.uint8), np.ones((length, 1), np.uint8))),
+                "vhgw": sum(best_time(lambda axis=axis: FastMorphology.running_extreme(image, lo, hi, axis))
+                            for axis in (0, 1)),
+            }
+        
+        if update:
+            # Shortest length from which van Herk / Gil-Werman keeps winning
+            crossover = max(lengths) + 1
+            for length in sorted(lengths, reverse=True):
+                if timings[length]["vhgw"] >= timings[length]["opencv"]:
+                    break
+                crossover = length
+            FastMorphology.VHGW_MIN_LENGTH = crossover
+        return timings
+    
+    @staticmethod
+    def is_beneficial(kernel_size, kernel_type, iterations=1):
+        """Whether the decomposed backend is faster than plain OpenCV"""
+        size = max(kernel_size)
+        if kernel_type == "ellipse":
+            return size >= FastMorphology.ELLIPSE_MIN_SIZE
+        if kernel_type == "cross":
+            return size >= FastMorphology.CROSS_MIN_SIZE
+        # Rect iterations collapse into one larger rectangle
+        return (size - 1) * iterations + 1 >= FastMorphology.VHGW_MIN_LENGTH
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def decompose(kernel_size, kernel_type):
+        """
+        Split a structuring element into rectangles
+        
+        Returns:
+            Tuple of (x_lo, x_hi, y_lo, y_hi) offsets relative to the anchor
+            (kernel center); the union of the rectangles is the element
+        """
+        kernel = MorphologicalFilters.create_kernel(kernel_size, kernel_type)
+        h, w = kernel.shape
+        cx, cy = w // 2, h // 2
+        
+        runs = []
+        for row in range(h):
+            cols = np.flatnonzero(kernel[row])
+            if len(cols) == 0:
+                continue
+            if cols[-1] - cols[0] + 1 != len(cols):
+                raise ValueError("Kernel rows must be contiguous runs")
+            runs.append((row, cols[0], cols[-1]))
+        
+        rects = []
+        for x0, x1 in sorted({(x0, x1) for _, x0, x1 in runs}):
+            # Rows whose run covers this one form a contiguous band (convex SE)
+            rows = [row for row, r0, r1 in runs if r0 <= x0 and r1 >= x1]
+            rects.append((x0 - cx, x1 - cx, min(rows) - cy, max(rows) - cy))
+        return tuple(rects)
+    
+    @staticmethod
+    def running_extreme(image, lo, hi, axis, minimum=True):
+        """
+        van Herk / Gil-Werman running min/max over the window [x+lo, x+hi]
+        
+        The padded line is cut into blocks of the window length; prefix and
+        suffix extremes inside each block give every window as the extreme of
+        one suffix and one prefix value. Out-of-image samples never win
+        (same border as cv2.erode / cv2.dilate).
+        """
+        size = hi - lo + 1
+        if size == 1 and lo == 0:
+            return image
+        
+        op = np.minimum if minimum else np.maximum
+        info = np.iinfo(image.dtype) if np.issubdtype(image.dtype, np.integer) \
+            else np.finfo(image.dtype)
+        fill = info.max if minimum else info.min
+        
+        n = image.shape[axis]
+        pad_before, pad_after = max(0, -lo), max(0, hi)
+        start = lo + pad_before
+        total = n + pad_before + pad_after
+        blocks = -(-total // size)
+        
+        pad_width = [(0, 0)] * image.ndim
+        pad_width[axis] = (pad_before, pad_after + blocks * size - total)
+        line = np.moveaxis(np.pad(image, pad_width, constant_values=fill), axis, 0)
+        
+        block_view = line.reshape((blocks, size) + line.shape[1:])
+        prefix = op.accumulate(block_view, axis=1).reshape(line.shape)
+        suffix = op.accumulate(block_view[:, ::-1], axis=1)[:, ::-1].reshape(line.shape)
+        
+        result = op(suffix[start:start + n], prefix[start + size - 1:start + size - 1 + n])
+        return np.ascontiguousarray(np.moveaxis(result, 0, axis))
+    
+    @staticmethod
+    def line_pass(image, lo, hi, axis, minimum=True):
+        """1D min/max over [x+lo, x+hi] along axis (0 = vertical, 1 = horizontal)"""
+        length = hi - lo + 1
+        if length == 1 and lo == 0:
+            return image
+        if length >= FastMorphology.VHGW_MIN_LENGTH or not lo <= 0 <= hi:
+            return FastMorphology.running_extreme(image, lo, hi, axis, minimum)
+        
+        if axis == 1:
+            line, anchor = np.ones((1, length), np.uint8), (-lo, 0)
+        else:
+            line, anchor = np.ones((length, 1), np.uint8), (0, -lo)
+        op = cv2.erode if minimum else cv2.dilate
+        return op(image, line, anchor=anchor)
+    
+    @staticmethod
+    def _apply(image, kernel_size, kernel_type, iterations, minimum):
+        """Shared erode/dilate driver"""
+        kernel_size = tuple(kernel_size)
+        combine = cv2.min if minimum else cv2.max
+        
+        if kernel_type == "rect":
+            # Rect iterated n times == one rect of n * (k - 1) + 1
+            (x_lo, x_hi, y_lo, y_hi), = FastMorphology.decompose(kernel_size, kernel_type)
+            result = FastMorphology.line_pass(image, x_lo * iterations, x_hi * iterations, 1, minimum)
+            return FastMorphology.line_pass(result, y_lo * iterations, y_hi * iterations, 0, minimum)
+        
+        rects = FastMorphology.decompose(kernel_size, kernel_type)
+        result = image
+        for _ in range(iterations):
+            source, result = result, None
+            for x_lo, x_hi, y_lo, y_hi in rects:
+                part = FastMorphology.line_pass(source, x_lo, x_hi, 1, minimum)
+                part = FastMorphology.line_pass(part, y_lo, y_hi, 0, minimum)
+                result = part if result is None else combine(result, part)
+        return result
+    
+    @staticmethod
+    def erode(image, kernel_size=(5, 5), kernel_type="rect", iterations=1):
+        """Erosion, identical to cv2.erode with the same structuring element"""
+        return FastMorphology._apply(image, kernel_size, kernel_type, iterations, True)
+    
+    @staticmethod
+    def dilate(image, kernel_size=(5, 5), kernel_type="rect", iterations=1):
+        """Dilation, identical to cv2.dilate with the same structuring element"""
+        return FastMorphology._apply(image, kernel_size, kernel_type, iterations, False)
@@ -14,6 +14,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from filters import LinearFilters, NonLinearFilters, EdgeDetection, GeometricTransforms, MorphologicalFilters
 from features.frequency_domain import FrequencyDomainAnalysis
+from features.adaptive_threshold import AdaptiveThresholder
+from features.color_lut import apply_cube_lut
 from features.color_enhancement import *
 from features.ai_filters import (
     AIColorCorrection, 
@@ -71,6 +73,7 @@ class SmartImageEditor:
         linear_menu.add_command(label="Mean Filter", command=self.apply_mean_filter)
         linear_menu.add_command(label="Gaussian Blur", command=self.apply_gaussian_filter)
         linear_menu.add_command(label="Sharpen", command=self.apply_sharpen_filter)
+        linear_menu.add_command(label="Unsharp Mask...", command=self.apply_unsharp_mask_dialog)
         
         # Non-linear filter
         filter_menu.add_command(label="Median Filter", command=self.apply_median_filter)
@@ -81,6 +84,10 @@ class SmartImageEditor:
         edge_menu.add_command(label="Sobel Edge", command=self.apply_sobel)
         edge_menu.add_command(label="Prewitt Edge", command=self.apply_prewitt)
         edge_menu.add_command(label="Laplacian Edge", command=self.apply_laplacian)
+        edge_menu.add_command(label="Scharr Edge", command=self.apply_scharr)
+        edge_menu.add_command(label="Canny Edge (Auto)", command=self.apply_canny)
+        edge_menu.add_command(label="Difference of Gaussians", command=self.apply_dog)
+        edge_menu.add_command(label="Multi-Scale Edges", command=self.apply_multiscale_edges)
 
         # Transform Menu
         transform_menu = tk.Menu(self.menu, tearoff=0)
@@ -127,16 +134,22 @@ class SmartImageEditor:
         color_menu.add_command(label="Gamma Correction...", command=self.adjust_gamma_dialog)
         color_menu.add_separator()
         color_menu.add_command(label="Histogram Equalization", command=self.apply_histogram_eq)
+        color_menu.add_command(label="Histogram Equalization (Luminance)", command=lambda: self.apply_histogram_eq("luminance"))
+        color_menu.add_command(label="Histogram Equalization (Per Channel)", command=lambda: self.apply_histogram_eq("per_channel"))
+        color_menu.add_command(label="Auto Levels", command=self.apply_auto_levels_fn)
+        color_menu.add_command(label="Auto Levels (Per Channel)", command=lambda: self.apply_auto_levels_fn(True))
+        color_menu.add_command(label="Apply 3D LUT (.cube)...", command=self.apply_cube_lut_fn)
         color_menu.add_separator()
         threshold_menu = tk.Menu(color_menu, tearoff=0)
         color_menu.add_cascade(label="Thresholding", menu=threshold_menu)
         threshold_menu.add_command(label="Global Threshold...", command=self.apply_global_threshold_dialog)
-        threshold_menu.add_command(label="Adaptive Threshold", command=self.apply_adaptive_threshold_fn)
+        threshold_menu.add_command(label="Adaptive Threshold...", command=self.apply_adaptive_threshold_dialog)
         blur_menu = tk.Menu(color_menu, tearoff=0)
         color_menu.add_cascade(label="Blur Effects", menu=blur_menu)
         blur_menu.add_command(label="Average Blur...", command=self.apply_average_blur_dialog)
         blur_menu.add_command(label="Gaussian Blur...", command=self.apply_gaussian_blur_dialog)
         blur_menu.add_command(label="Median Blur...", command=self.apply_median_blur_dialog)
+        blur_menu.add_command(label="Denoise (Edge-Preserving)...", command=self.apply_denoise_dialog)
         
         # AI Filters Menu (NEW!)
         ai_menu = tk.Menu(self.menu, tearoff=0)
@@ -439,6 +452,41 @@ class SmartImageEditor:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to apply filter:\n{e}")
 
+    def apply_unsharp_mask_dialog(self):
+        if self.image is None:
+            messagebox.showwarning("No Image", "Please open an image first!")
+            return
+        sharpen_win = tk.Toplevel(self.root)
+        sharpen_win.title("Unsharp Mask")
+        sharpen_win.geometry("350x300")
+        tk.Label(sharpen_win, text="Radius (pixels):").pack(pady=5)
+        radius_scale = tk.Scale(sharpen_win, from_=0.5, to=20, resolution=0.5, orient="horizontal")
+        radius_scale.set(1.0)
+        radius_scale.pack()
+        tk.Label(sharpen_win, text="Amount (%):").pack()
+        amount_scale = tk.Scale(sharpen_win, from_=0, to=500, orient="horizontal")
+        amount_scale.set(100)
+        amount_scale.pack()
+        tk.Label(sharpen_win, text="Threshold (0 to 255):").pack()
+        threshold_scale = tk.Scale(sharpen_win, from_=0, to=255, orient="horizontal")
+        threshold_scale.set(0)
+        threshold_scale.pack()
+        luminance_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(sharpen_win, text="Luminance only", variable=luminance_var).pack()
+        def apply_sharpen():
+            try:
+                cv_img = self.pil_to_cv(self.image)
+                sharpened = self.linear_filters.unsharp_mask(
+                    cv_img, radius=radius_scale.get(), amount=amount_scale.get() / 100.0,
+                    threshold=threshold_scale.get(), luminance_only=luminance_var.get())
+                self.image = self.cv_to_pil(sharpened)
+                self.display_image()
+                self.status.config(text=f"Unsharp mask applied: radius {radius_scale.get()}, amount {amount_scale.get()}%")
+                sharpen_win.destroy()
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to apply unsharp mask:\n{e}")
+        tk.Button(sharpen_win, text="Apply", command=apply_sharpen).pack(pady=10)
+
     def apply_median_filter(self):
         if self.image is None:
             messagebox.showwarning("No Image", "Please open an image first!")
@@ -491,6 +539,58 @@ class SmartImageEditor:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to apply filter:\n{e}")
 
+    def apply_scharr(self):
+        if self.image is None:
+            messagebox.showwarning("No Image", "Please open an image first!")
+            return
+        try:
+            cv_img = self.pil_to_cv(self.image)
+            filtered = self.edge_detection.scharr_edge(cv_img)
+            self.image = self.cv_to_pil(filtered)
+            self.display_image()
+            self.status.config(text="Scharr edge detection applied")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to apply filter:\n{e}")
+
+    def apply_canny(self):
+        if self.image is None:
+            messagebox.showwarning("No Image", "Please open an image first!")
+            return
+        try:
+            cv_img = self.pil_to_cv(self.image)
+            filtered = self.edge_detection.canny_edge(cv_img)
+            self.image = self.cv_to_pil(filtered)
+            self.display_image()
+            self.status.config(text="Canny edge detection applied (auto thresholds)")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to apply filter:\n{e}")
+
+    def apply_dog(self):
+        if self.image is None:
+            messagebox.showwarning("No Image", "Please open an image first!")
+            return
+        try:
+            cv_img = self.pil_to_cv(self.image)
+            filtered = self.edge_detection.dog_edge(cv_img)
+            self.image = self.cv_to_pil(filtered)
+            self.display_image()
+            self.status.config(text="Difference of Gaussians applied")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to apply filter:\n{e}")
+
+    def apply_multiscale_edges(self):
+        if self.image is None:
+            messagebox.showwarning("No Image", "Please open an image first!")
+            return
+        try:
+            cv_img = self.pil_to_cv(self.image)
+            filtered = self.edge_detection.multiscale_edge(cv_img)
+            self.image = self.cv_to_pil(filtered)
+            self.display_image()
+            self.status.config(text="Multi-scale edge detection applied")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to apply filter:\n{e}")
+
     def crop_image_dialog(self):
         if self.image is None:
             messagebox.showwarning("No Image", "Please open an image first!")
@@ -561,7 +661,8 @@ class SmartImageEditor:
             return
         try:
             cv_img = self.pil_to_cv(self.image)
-            rotated = self.geometric_transforms.rotate_90(cv_img, k)
+            # Views are enough: cv_to_pil's color conversion makes the only copy
+            rotated = self.geometric_transforms.rotate_90(cv_img, k, contiguous=False)
             self.image = self.cv_to_pil(rotated)
             self.display_image()
             angle = k * 90
@@ -604,7 +705,7 @@ class SmartImageEditor:
             return
         try:
             cv_img = self.pil_to_cv(self.image)
-            flipped = self.geometric_transforms.flip_image(cv_img, flip_code)
+            flipped = self.geometric_transforms.flip_image(cv_img, flip_code, contiguous=False)
             self.image = self.cv_to_pil(flipped)
             self.display_image()
             flip_type = "Horizontal" if flip_code == 1 else "Vertical"
@@ -690,19 +791,48 @@ class SmartImageEditor:
                 messagebox.showerror("Error", f"Failed to apply gamma:\n{e}")
         tk.Button(gamma_win, text="Apply", command=apply_gamma_correction).pack(pady=10)
     
-    def apply_histogram_eq(self):
+    def apply_histogram_eq(self, mode="gray"):
         if self.image is None:
             messagebox.showwarning("No Image", "Please open an image first!")
             return
         try:
             cv_img = self.pil_to_cv(self.image)
-            equalized = apply_histogram_equalization(cv_img)
+            equalized = apply_histogram_equalization(cv_img, mode=mode)
             self.image = self.cv_to_pil(equalized)
             self.display_image()
-            self.status.config(text="Histogram equalization applied")
+            self.status.config(text=f"Histogram equalization applied ({mode})")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to apply histogram equalization:\n{e}")
     
+    def apply_auto_levels_fn(self, per_channel=False):
+        if self.image is None:
+            messagebox.showwarning("No Image", "Please open an image first!")
+            return
+        try:
+            cv_img = self.pil_to_cv(self.image)
+            leveled = apply_auto_levels(cv_img, per_channel=per_channel)
+            self.image = self.cv_to_pil(leveled)
+            self.display_image()
+            self.status.config(text="Auto levels applied" + (" (per channel)" if per_channel else ""))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to apply auto levels:\n{e}")
+    
+    def apply_cube_lut_fn(self):
+        if self.image is None:
+            messagebox.showwarning("No Image", "Please open an image first!")
+            return
+        path = filedialog.askopenfilename(title="Select 3D LUT", filetypes=[("Cube LUT", "*.cube")])
+        if not path:
+            return
+        try:
+            cv_img = self.pil_to_cv(self.image)
+            graded = apply_cube_lut(cv_img, path)
+            self.image = self.cv_to_pil(graded)
+            self.display_image()
+            self.status.config(text=f"3D LUT applied: {os.path.basename(path)}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to apply 3D LUT:\n{e}")
+    
     def apply_global_threshold_dialog(self):
         if self.image is None:
             messagebox.showwarning("No Image", "Please open an image first!")
@@ -727,19 +857,45 @@ class SmartImageEditor:
                 messagebox.showerror("Error", f"Failed to apply threshold:\n{e}")
         tk.Button(threshold_win, text="Apply", command=apply_threshold).pack(pady=10)
     
-    def apply_adaptive_threshold_fn(self):
+    def apply_adaptive_threshold_dialog(self):
         if self.image is None:
             messagebox.showwarning("No Image", "Please open an image first!")
             return
-        try:
-            cv_img = self.pil_to_cv(self.image)
-            thresholded = apply_adaptive_threshold(cv_img)
-            thresholded_bgr = cv2.cvtColor(thresholded, cv2.COLOR_GRAY2BGR)
-            self.image = self.cv_to_pil(thresholded_bgr)
-            self.display_image()
-            self.status.config(text="Adaptive threshold applied")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to apply adaptive threshold:\n{e}")
+        threshold_win = tk.Toplevel(self.root)
+        threshold_win.title("Adaptive Threshold")
+        threshold_win.geometry("350x330")
+        tk.Label(threshold_win, text="Method:").pack(pady=5)
+        method_var = tk.StringVar(value="gaussian")
+        def on_method_change(method):
+            # Niblack wants a negative k, Sauvola a positive one
+            k_scale.set(AdaptiveThresholder.DEFAULT_K.get(method, 0.0))
+        tk.OptionMenu(threshold_win, method_var, "gaussian", "mean", "niblack", "sauvola",
+                      command=on_method_change).pack()
+        tk.Label(threshold_win, text="Block Size:").pack()
+        block_scale = tk.Scale(threshold_win, from_=3, to=101, resolution=2, orient="horizontal")
+        block_scale.set(11)
+        block_scale.pack()
+        tk.Label(threshold_win, text="C (subtracted from threshold):").pack()
+        c_scale = tk.Scale(threshold_win, from_=-20, to=20, orient="horizontal")
+        c_scale.set(2)
+        c_scale.pack()
+        tk.Label(threshold_win, text="k (Niblack / Sauvola):").pack()
+        k_scale = tk.Scale(threshold_win, from_=-0.5, to=0.5, resolution=0.05, orient="horizontal")
+        k_scale.set(AdaptiveThresholder.DEFAULT_K.get(method_var.get(), 0.0))
+        k_scale.pack()
+        def apply_threshold():
+            try:
+                cv_img = self.pil_to_cv(self.image)
+                method = method_var.get()
+                thresholded = apply_adaptive_threshold(cv_img, block_scale.get(), c_scale.get(), method, k_scale.get())
+                thresholded_bgr = cv2.cvtColor(thresholded, cv2.COLOR_GRAY2BGR)
+                self.image = self.cv_to_pil(thresholded_bgr)
+                self.display_image()
+                self.status.config(text=f"Adaptive threshold applied ({method}, block {block_scale.get()})")
+                threshold_win.destroy()
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to apply adaptive threshold:\n{e}")
+        tk.Button(threshold_win, text="Apply", command=apply_threshold).pack(pady=10)
     
     def apply_average_blur_dialog(self):
         if self.image is None:
@@ -809,6 +965,31 @@ class SmartImageEditor:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to apply blur:\n{e}")
         tk.Button(blur_win, text="Apply", command=apply_blur).pack(pady=10)
+    
+    def apply_denoise_dialog(self):
+        if self.image is None:
+            messagebox.showwarning("No Image", "Please open an image first!")
+            return
+        denoise_win = tk.Toplevel(self.root)
+        denoise_win.title("Denoise")
+        denoise_win.geometry("350x180")
+        tk.Label(denoise_win, text="Method:").pack(pady=5)
+        method_var = tk.StringVar(value="guided")
+        tk.OptionMenu(denoise_win, method_var, "guided", "bilateral", "nlmeans").pack()
+        tk.Label(denoise_win, text="Preset:").pack()
+        preset_var = tk.StringVar(value="balanced")
+        tk.OptionMenu(denoise_win, preset_var, "fast", "balanced", "quality").pack()
+        def apply_denoise_fn():
+            try:
+                cv_img = self.pil_to_cv(self.image)
+                denoised = apply_denoise(cv_img, method_var.get(), preset_var.get(), workers=None)
+                self.image = self.cv_to_pil(denoised)
+                self.display_image()
+                self.status.config(text=f"Denoise applied: {method_var.get()} ({preset_var.get()})")
+                denoise_win.destroy()
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to denoise:\n{e}")
+        tk.Button(denoise_win, text="Apply", command=apply_denoise_fn).pack(pady=10)
             # ---- AI COLOR CORRECTION FUNCTIONS ----
     
     def ai_full_color_correction_dialog(self):
@@ -1127,8 +1308,8 @@ class SmartImageEditor:
                 font=("Arial", 12, "bold")).pack(pady=10)
         
         # Kernel size
-        tk.Label(dialog, text="Kernel Size (3-15, odd numbers):").pack(pady=(10,0))
-        size_scale = tk.Scale(dialog, from_=3, to=15, resolution=2, orient="horizontal")
+        tk.Label(dialog, text="Kernel Size (3-51, odd numbers):").pack(pady=(10,0))
+        size_scale = tk.Scale(dialog, from_=3, to=51, resolution=2, orient="horizontal")
         size_scale.set(5)
         size_scale.pack()
         
@@ -1204,16 +1385,11 @@ class SmartImageEditor:
             kernel_size = (5, 5)
             kernel_type = "rect"
             
-            results = {
-                "Original": cv_img,
-                "Erosion": self.morphological.erosion(cv_img, kernel_size, kernel_type),
-                "Dilation": self.morphological.dilation(cv_img, kernel_size, kernel_type),
-                "Opening": self.morphological.opening(cv_img, kernel_size, kernel_type),
-                "Closing": self.morphological.closing(cv_img, kernel_size, kernel_type),
-                "Gradient": self.morphological.morphological_gradient(cv_img, kernel_size, kernel_type),
-                "Top Hat": self.morphological.top_hat(cv_img, kernel_size, kernel_type),
-                "Black Hat": self.morphological.black_hat(cv_img, kernel_size, kernel_type)
-            }
+            # One erode + one dilate feed all seven variants
+            results = {"Original": cv_img}
+            results.update(
+                self.morphological.morphology_bundle(cv_img, kernel_size, kernel_type)
+            )
             
             # Create comparison window
             comp_win = tk.Toplevel(self.root)
@@ -12,7 +12,10 @@ import time
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from filters import LinearFilters, NonLinearFilters, EdgeDetection, GeometricTransforms
+from filters import LinearFilters, NonLinearFilters, EdgeDetection, GeometricTransforms, TransformStack
+from features.image_cache import ImageCache
+from features.hue_saturation import HueSaturation
+from features.image_statistics import ImageStatistics
 from features.ai_filters import (
     AIColorCorrection,
     BackgroundRemoval,
@@ -69,6 +72,11 @@ class ModernImageEditor(ctk.CTk):
         self.crop_rect = None
         self.crop_rect_id = None
 
+        # Persistent frequency analysis window (reused between calls)
+        self.freq_window = None
+        self.freq_visualizer = None
+        self.freq_canvas = None
+
         # Add resize aspect ratio lock
         self.aspect_ratio_locked = True
         self.original_aspect_ratio = None
@@ -84,6 +92,10 @@ class ModernImageEditor(ctk.CTk):
         self.edge_detection = EdgeDetection()
         self.geometric_transforms = GeometricTransforms()
 
+        # Chained geometry edits are resampled once from the chain's source
+        self.transform_stack = None
+        self.transform_result = None
+
         # ===== HISTORY SYSTEM =====
         self.history = []  # Stack of history states
         self.history_index = -1  # Current position in history
@@ -1866,6 +1878,20 @@ class ModernImageEditor(ctk.CTk):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to apply drawings:\n{e}")        
         
+    # ===== TRANSFORM STACK =====
+
+    def get_transform_stack(self):
+        """Geometry chain for the current image (restarted after any other edit)"""
+        if self.transform_stack is None or self.image is not self.transform_result:
+            self.transform_stack = TransformStack(self.image)
+        return self.transform_stack
+
+    def render_transform_stack(self):
+        """Render the whole geometry chain in one pass into self.image"""
+        self.image = self.transform_stack.render()
+        self.transform_result = self.image
+        self.original_image = self.image.copy()
+
     # ===== ROTATE METHODS =====
 
     def rotate_image(self, angle):
@@ -1885,8 +1911,8 @@ class ModernImageEditor(ctk.CTk):
             else:
                 return
 
-            self.image = np.rot90(self.image, k)
-            self.original_image = self.image.copy()
+            self.get_transform_stack().rotate_90(k)
+            self.render_transform_stack()
 
             # Add to history
             self.add_to_history(f"Rotate {angle}°")
@@ -1913,26 +1939,9 @@ class ModernImageEditor(ctk.CTk):
 
             angle = float(angle_str)
 
-            # Get image center
-            h, w = self.image.shape[:2]
-            center = (w // 2, h // 2)
-
-            # Get rotation matrix
-            M = cv2.getRotationMatrix2D(center, angle, 1.0)
-
-            # Calculate new size to fit entire rotated image
-            cos = abs(M[0, 0])
-            sin = abs(M[0, 1])
-            new_w = int((h * sin) + (w * cos))
-            new_h = int((h * cos) + (w * sin))
-
-            # Adjust translation
-            M[0, 2] += (new_w / 2) - center[0]
-            M[1, 2] += (new_h / 2) - center[1]
-
-            # Apply rotation
-            self.image = cv2.warpAffine(self.image, M, (new_w, new_h))
-            self.original_image = self.image.copy()
+            # Compose with earlier geometry edits, resample once
+            self.get_transform_stack().rotate(angle, expand=True)
+            self.render_transform_stack()
             self.add_to_history(f"Rotate {angle}°")  # ← ADD THIS
             self.display_image_on_canvas()
             self.update_status(f"✅ Rotated {angle}°")
@@ -1954,8 +1963,8 @@ class ModernImageEditor(ctk.CTk):
             return
 
         try:
-            self.image = cv2.flip(self.image, flip_code)
-            self.original_image = self.image.copy()
+            self.get_transform_stack().flip(flip_code)
+            self.render_transform_stack()
 
             flip_type = "horizontal" if flip_code == 1 else "vertical"
 
@@ -2073,8 +2082,8 @@ class ModernImageEditor(ctk.CTk):
                 return
 
             # Crop image
-            self.image = self.image[img_y1:img_y2, img_x1:img_x2]
-            self.original_image = self.image.copy()
+            self.get_transform_stack().crop(img_x1, img_y1, img_x2 - img_x1, img_y2 - img_y1)
+            self.render_transform_stack()
 
             # Add to history
             self.add_to_history(f"Crop to {img_x2-img_x1}×{img_y2-img_y1}px")
@@ -2174,10 +2183,8 @@ class ModernImageEditor(ctk.CTk):
                 return
 
             # Resize image
-            self.image = cv2.resize(
-                self.image, (new_width, new_height), interpolation=cv2.INTER_LANCZOS4
-            )
-            self.original_image = self.image.copy()
+            self.get_transform_stack().resize(new_width, new_height)
+            self.render_transform_stack()
 
             # Add to history
             self.add_to_history(f"Resize to {new_width}×{new_height}px")
@@ -2221,6 +2228,10 @@ class ModernImageEditor(ctk.CTk):
                     ("Sobel", self.apply_sobel),
                     ("Prewitt", self.apply_prewitt),
                     ("Laplacian", self.apply_laplacian),
+                    ("Scharr", self.apply_scharr),
+                    ("Canny (Auto)", self.apply_canny),
+                    ("Difference of Gaussians", self.apply_dog),
+                    ("Multi-Scale Edges", self.apply_multiscale_edges),
                 ],
             ),
             (
@@ -2545,11 +2556,12 @@ class ModernImageEditor(ctk.CTk):
         )
         stats_title.pack(pady=10)
         
-        # Calculate statistics
+        # Calculate statistics (estimated from a subsample of the image)
+        means = ImageStatistics.channel_means(self.image)
         if len(self.image.shape) == 3 and self.image.shape[2] >= 3:
-            b_mean = int(np.mean(self.image[:,:,0]))
-            g_mean = int(np.mean(self.image[:,:,1]))
-            r_mean = int(np.mean(self.image[:,:,2]))
+            b_mean = int(means[0])
+            g_mean = int(means[1])
+            r_mean = int(means[2])
             
             brightness = int((r_mean + g_mean + b_mean) / 3)
             
@@ -2560,7 +2572,7 @@ class ModernImageEditor(ctk.CTk):
                 ("Overall Brightness", f"{brightness}"),
             ]
         else:
-            mean_val = int(np.mean(self.image))
+            mean_val = int(means.mean())
             stats_data = [
                 ("Average Intensity", f"{mean_val}"),
             ]
@@ -2696,22 +2708,28 @@ class ModernImageEditor(ctk.CTk):
             return
         
         try:
-            from features.frequency_domain import FrequencyDomainAnalysis
+            from features.frequency_domain import FrequencyVisualizer
             from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
             
+            # Show analysis
+            self.update_status("⏳ Computing frequency analysis...")
+            self.update()
+            
+            # Reuse the open window and figure; only the artists' data changes
+            if self.freq_window is not None and self.freq_window.winfo_exists():
+                self.freq_visualizer.update(self.image, title="Frequency Domain Analysis")
+                self.freq_canvas.draw_idle()
+                self.freq_window.lift()
+                self.update_status("✅ Frequency analysis updated")
+                return
+            
             # Create window
             freq_window = ctk.CTkToplevel(self)
             freq_window.title("Frequency Domain Analysis")
             freq_window.geometry("1200x800")
             
-            # Show analysis
-            self.update_status("⏳ Computing frequency analysis...")
-            self.update()
-            
-            fig = FrequencyDomainAnalysis.visualize_frequency_analysis(
-                self.image,
-                title="Frequency Domain Analysis"
-            )
+            visualizer = FrequencyVisualizer()
+            fig = visualizer.update(self.image, title="Frequency Domain Analysis")
             
             # Dark theme for matplotlib
             fig.patch.set_facecolor('#2b2b2b')
@@ -2724,11 +2742,15 @@ class ModernImageEditor(ctk.CTk):
                 for spine in ax.spines.values():
                     spine.set_color('white')
             
-            # Embed in tkinter
+            # Embed in tkinter (draw_idle lets Tk render on its next idle cycle)
             canvas = FigureCanvasTkAgg(fig, freq_window)
-            canvas.draw()
+            canvas.draw_idle()
             canvas.get_tk_widget().pack(fill="both", expand=True)
             
+            self.freq_window = freq_window
+            self.freq_visualizer = visualizer
+            self.freq_canvas = canvas
+            
             self.update_status("✅ Frequency analysis displayed")
             
         except Exception as e:
@@ -2858,18 +2880,19 @@ class ModernImageEditor(ctk.CTk):
 
             # Apply saturation adjustment
             if self.temp_saturation != 0:
-                # Convert to HSV
-                hsv = cv2.cvtColor(preview, cv2.COLOR_BGR2HSV).astype(np.float32)
+                # Convert to HSV (cached per original while only saturation moves)
+                if self.temp_brightness == 0 and self.temp_contrast == 0:
+                    hsv = ImageCache.for_image(self.original_image).hsv
+                else:
+                    hsv = cv2.cvtColor(preview, cv2.COLOR_BGR2HSV)
 
-                # Adjust saturation channel
+                # Scale the saturation channel with a saturating LUT
                 saturation_scale = 1.0 + (self.temp_saturation / 100.0)
-                hsv[:, :, 1] = hsv[:, :, 1] * saturation_scale
-
-                # Clip to valid range
-                hsv[:, :, 1] = np.clip(hsv[:, :, 1], 0, 255)
+                hsv_lut, _ = HueSaturation.compile(scale=saturation_scale)
+                hsv = HueSaturation.apply_hsv(hsv, hsv_lut)
 
                 # Convert back to BGR
-                preview = cv2.cvtColor(hsv.astype(np.uint8), cv2.COLOR_HSV2BGR)
+                preview = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
 
             # Update displayed image
             self.image = preview
@@ -3042,6 +3065,43 @@ class ModernImageEditor(ctk.CTk):
         self.display_image_on_canvas()
         self.update_status("Laplacian edge detection applied")
 
+    def apply_scharr(self):
+        if self.image is None:
+            messagebox.showwarning("No Image", "Please open an image first!")
+            return
+        self.image = self.edge_detection.scharr_edge(self.image)
+        self.add_to_history("Scharr Edge Detection")
+        self.display_image_on_canvas()
+        self.update_status("Scharr edge detection applied")
+
+    def apply_canny(self):
+        if self.image is None:
+            messagebox.showwarning("No Image", "Please open an image first!")
+            return
+        low, high = self.edge_detection.auto_canny_thresholds(self.image)
+        self.image = self.edge_detection.canny_edge(self.image, low, high)
+        self.add_to_history("Canny Edge Detection")
+        self.display_image_on_canvas()
+        self.update_status(f"Canny edge detection applied (thresholds {low}/{high})")
+
+    def apply_dog(self):
+        if self.image is None:
+            messagebox.showwarning("No Image", "Please open an image first!")
+            return
+        self.image = self.edge_detection.dog_edge(self.image)
+        self.add_to_history("Difference of Gaussians")
+        self.display_image_on_canvas()
+        self.update_status("Difference of Gaussians applied")
+
+    def apply_multiscale_edges(self):
+        if self.image is None:
+            messagebox.showwarning("No Image", "Please open an image first!")
+            return
+        self.image = self.edge_detection.multiscale_edge(self.image)
+        self.add_to_history("Multi-Scale Edges")
+        self.display_image_on_canvas()
+        self.update_status("Multi-scale edge detection applied")
+
     # ===== AI FEATURES =====
 
     def ai_color_correction(self):
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Test script: tiled execution must match whole-image execution
+Simpan di root folder (sama level dengan gui/)
+Run: python test_tiling.py   (atau: python -m pytest test_tiling.py)
+"""
+
+import numpy as np
+
+from features.denoise import Denoiser
+from features.operations import OperationRegistry
+
+# Odd heights/widths catch subsampled operations whose bands do not
+# divide evenly by the reduction factor
+SHAPES = [(601, 403), (1200, 800), (333, 257)]
+
+
+def make_image(shape, seed=0):
+    rng = np.random.default_rng(seed)
+    h, w = shape
+    image = np.zeros((h, w, 3), dtype=np.uint8)
+    image[:, w // 2:] = 200
+    image[h // 3:2 * h // 3, :, 1] = 120
+    noise = rng.normal(0, 15, image.shape)
+    return np.clip(image + noise, 0, 255).astype(np.uint8)
+
+
+def test_denoise_tiled_matches_whole():
+    for shape in SHAPES:
+        image = make_image(shape)
+        for method in ("guided", "bilateral"):
+            for preset in Denoiser.PRESETS[method]:
+                whole = Denoiser.denoise(image, method, preset)
+                tiled = Denoiser.denoise(image, method, preset, workers=4)
+                diff = int(np.abs(whole.astype(int) - tiled).max())
+                assert diff == 0, f"{method}/{preset} {shape}: max diff {diff}"
+
+
+def test_registry_tiled_matches_whole():
+    image = make_image((601, 403))
+    for name in OperationRegistry.names():
+        if name == "nlmeans":
+            continue  # slow; covered by its halo formula
+        whole = OperationRegistry.apply(name, image)
+        tiled = OperationRegistry.apply(name, image, workers=3)
+        diff = int(np.abs(whole.astype(int) - tiled).max())
+        assert diff == 0, f"{name}: max diff {diff}"
+
+
+if __name__ == "__main__":
+    for test in (test_denoise_tiled_matches_whole, test_registry_tiled_matches_whole):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")